@@ -0,0 +1,222 @@
+import io
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3Error
+from events import EVENTS
+from metrics import METRICS
+from records import PARSE_ERRORS, parse_page
+
+# 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 공공데이터포털 nkoneps.com.response.ResponseError 오류 코드
+API_ERROR_CODES = {
+    "01": "어플리케이션 에러",
+    "02": "데이터베이스 에러",
+    "03": "데이터 없음",
+    "04": "HTTP 에러",
+    "05": "서비스 연결 실패",
+    "10": "잘못된 요청 파라미터",
+    "11": "필수 요청 파라미터 없음",
+    "12": "해당 오픈API 서비스가 없거나 폐기됨",
+    "20": "서비스 접근 거부",
+    "21": "일시적으로 사용할 수 없는 서비스 키",
+    "22": "서비스 요청 제한 횟수 초과",
+    "30": "등록되지 않은 서비스 키",
+    "31": "기한 만료된 서비스 키",
+    "32": "등록되지 않은 IP",
+    "33": "서명되지 않은 호출",
+    "99": "기타 에러",
+}
+
+# 재시도로 회복 가능한 API 오류 코드 (서버 일시 장애 및 요청 제한)
+RETRYABLE_API_CODES = {"01", "02", "04", "05", "22"}
+
+class TokenBucket:
+    """초당 요청 수 제한용 토큰 버킷"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개 획득 - 대기한 시간(초) 반환"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+class ApiClient:
+    """공공데이터 API 공용 클라이언트
+
+    keep-alive 연결 풀, 요청 타임아웃, 지수 백오프 재시도와
+    토큰 버킷 기반 요청 속도 제한을 제공한다.
+    response_cache 가 주어지면 정상 응답을 디스크에 보관하여 재실행 시 재사용한다.
+    """
+
+    def __init__(self, rate_limit=20, timeout=10, max_retries=3,
+                 backoff_base=0.5, backoff_max=30, pool_size=16, response_cache=None):
+        self.response_cache = response_cache
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(rate_limit) if rate_limit > 0 else None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "retries": 0,
+            "failures": 0,
+            "throttle_waits": 0,
+            "throttle_wait_seconds": 0.0,
+        }
+
+    def _count(self, key, amount=1):
+        """통계 카운터 증가"""
+        with self.stats_lock:
+            self.stats[key] += amount
+
+    def _backoff(self, attempt):
+        """지수 백오프 + 지터 대기"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        time.sleep(random.uniform(0, delay))
+
+    def _throttle(self):
+        """요청 속도 제한 적용"""
+        if self.limiter is None:
+            return
+        waited = self.limiter.acquire()
+        if waited > 0:
+            self._count("throttle_waits")
+            self._count("throttle_wait_seconds", waited)
+
+    def get_page(self, api_url, params, name, record_type=None):
+        """API 단일 페이지 요청 - (레코드 목록, 전체 건수) 반환, 재시도 후에도 실패 시 None"""
+        if self.response_cache is not None:
+            stream = self.response_cache.open(api_url, params)
+            if stream is not None:
+                try:
+                    with stream:
+                        items, total_count, error = parse_page(stream, record_type)
+                    if error is None:
+                        self._count("cache_hits")
+                        return items, total_count
+                except (OSError,) + PARSE_ERRORS:
+                    # 손상된 캐시 파일은 없는 것으로 처리
+                    pass
+            if self.response_cache.replay:
+                print(f"[{name}] 재생 모드: 캐시된 응답이 없습니다.")
+                self._count("failures")
+                return None
+
+        return self._fetch_page(api_url, params, name, record_type)
+
+    def _read_page(self, response, api_url, params, record_type):
+        """응답 본문 해석 - 응답 캐시 사용 시에만 원본 바이트를 모아 저장"""
+        if self.response_cache is None:
+            response.raw.decode_content = True
+            return parse_page(response.raw, record_type)
+
+        content = response.content
+        items, total_count, error = parse_page(io.BytesIO(content), record_type)
+        if error is None:
+            self.response_cache.put(api_url, params, content)
+        return items, total_count, error
+
+    def _fetch_page(self, api_url, params, name, record_type):
+        """API 요청 (재시도 포함) - 본문은 스트림으로 읽으며 항목 단위로 해석"""
+        operation = api_url.rstrip("/").rsplit("/", 1)[-1]
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                self._count("retries")
+                self._backoff(attempt - 1)
+
+            self._throttle()
+            self._count("requests")
+
+            try:
+                with METRICS.timer("bidnotice_api_request_duration_seconds", operation=operation):
+                    response = self.session.get(api_url, params=params, timeout=self.timeout, stream=True)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # 예외 메시지에 ServiceKey 가 포함된 요청 URL 이 들어 있어 가린 뒤 출력
+                print(f"[{name}] API 연결 오류 ({attempt + 1}회차): {EVENTS.redact(str(e))}")
+                METRICS.inc("bidnotice_api_errors_total", kind="connection", code="", operation=operation)
+                continue
+
+            with response:
+                if response.status_code != 200:
+                    METRICS.inc("bidnotice_api_errors_total", kind="http", code=str(response.status_code), operation=operation)
+
+                # 요청 URL 의 ServiceKey 는 이벤트 로그 기록 시 가려짐
+                EVENTS.debug(
+                    "api.request", source=name, operation=operation, url=response.request.url,
+                    status=response.status_code, attempt=attempt + 1,
+                )
+
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    print(f"API 오류 발생: {response.status_code} ({attempt + 1}회차)")
+                    continue
+
+                if response.status_code != 200:
+                    print(f"API 오류 발생: {response.status_code}")
+                    print(EVENTS.redact(response.text))
+                    break
+
+                try:
+                    items, total_count, error = self._read_page(response, api_url, params, record_type)
+                except (requests.RequestException, Urllib3Error) as e:
+                    print(f"[{name}] 응답 수신 오류 ({attempt + 1}회차): {EVENTS.redact(str(e))}")
+                    METRICS.inc("bidnotice_api_errors_total", kind="connection", code="", operation=operation)
+                    continue
+                except PARSE_ERRORS:
+                    print(f"[{name}] JSON 파싱 오류")
+                    break
+
+            # API 에러 응답 체크
+            if error is not None:
+                error_code = error.get("resultCode")
+                error_msg = error.get("resultMsg") or API_ERROR_CODES.get(error_code, "")
+                print(f"[{name}] API 오류 발생 - 코드: {error_code}, 메시지: {error_msg}")
+                METRICS.inc("bidnotice_api_errors_total", kind="response_error", code=str(error_code), operation=operation)
+                if error_code in RETRYABLE_API_CODES:
+                    continue
+                break
+
+            return items, total_count
+
+        self._count("failures")
+        return None
+
+    def print_stats(self):
+        """요청·재시도·속도 제한 통계 출력"""
+        with self.stats_lock:
+            stats = dict(self.stats)
+        if stats["requests"] == 0 and stats["cache_hits"] == 0 and stats["failures"] == 0:
+            return
+        print(
+            f"[API 클라이언트] 요청 {stats['requests']}건, 응답 캐시 사용 {stats['cache_hits']}건, "
+            f"재시도 {stats['retries']}건, "
+            f"실패 {stats['failures']}건, 속도 제한 대기 {stats['throttle_waits']}회 "
+            f"({stats['throttle_wait_seconds']:.2f}초)"
+        )
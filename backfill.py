@@ -0,0 +1,134 @@
+import argparse
+from datetime import datetime, timedelta
+from common import FETCH_MODE_WINDOW, TIME_FORMAT, WINDOW_MODE_BATCH, load_json, prefetch_api_requests, reset_request_cache, save_json
+from conditions import needs_window
+from pipeline import load_run_context, run_pipeline
+from main import NOTICE_TYPES, parse_time, parse_types
+from sharding import shard_path
+
+# 과거 구간 재처리 설정
+BACKFILL_STATE_FILE = "backfill_state.json"
+
+def parse_args(argv=None):
+    """명령행 인자 해석"""
+    parser = argparse.ArgumentParser(description="과거 구간 공고 알림 재처리")
+    parser.add_argument("--from", dest="since", required=True, type=parse_time, metavar="YYYYMMDDHHMM", help="시작 일시")
+    parser.add_argument("--to", dest="until", required=True, type=parse_time, metavar="YYYYMMDDHHMM", help="종료 일시")
+    parser.add_argument("--chunk-hours", type=int, default=24, help="한 번에 조회할 구간 크기(시간)")
+    parser.add_argument("--parallel", type=int, default=4, help="동시에 조회할 구간 수")
+    parser.add_argument("--silent", action="store_true", help="문자 발송 없이 발송 이력만 반영")
+    parser.add_argument("--users", help="처리할 사용자 이름 (쉼표 구분, 기본: 전체)")
+    parser.add_argument("--types", type=parse_types, metavar="TYPE[,TYPE]", help="처리할 공고 유형 (쉼표 구분, 예: bid,pre)")
+    parser.add_argument("--restart", action="store_true", help="진행 기록을 무시하고 처음부터 실행")
+    args = parser.parse_args(argv)
+    if args.since >= args.until:
+        parser.error("--from 은 --to 보다 이전이어야 합니다.")
+    if args.chunk_hours < 1:
+        parser.error("--chunk-hours 는 1 이상이어야 합니다.")
+    if args.parallel < 1:
+        parser.error("--parallel 은 1 이상이어야 합니다.")
+    return args
+
+def split_range(since, until, chunk_hours):
+    """조회 구간을 chunk_hours 크기 구간 목록으로 분할"""
+    chunks = []
+    bgn = since
+    while bgn < until:
+        end = min(bgn + timedelta(hours=chunk_hours), until)
+        chunks.append((bgn.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT)))
+        bgn = end
+    return chunks
+
+def load_backfill_state(path, run_key):
+    """진행 기록 로딩 - 같은 조건의 재처리가 아니면 빈 기록"""
+    state = load_json(path)
+    if state.get('run') == run_key:
+        return state
+    return {'run': run_key, 'completed': []}
+
+def save_backfill_state(state, path):
+    """진행 기록 저장 (임시 파일 작성 후 교체)"""
+    save_json(state, path)
+
+def prefetch_chunks(ctx, notice_types, chunks, workers):
+    """여러 구간의 조회를 병렬 요청하여 요청 캐시에 적재 (API 속도 제한 공유)"""
+    service_key = ctx.env_vars['service_key']
+    window_fetch = ctx.env_vars['fetch_mode'] == FETCH_MODE_WINDOW
+    for notice_type in notice_types:
+        conditions = ctx.subscribers.conditions(notice_type.type)
+        if not conditions:
+            continue
+        params_list = []
+        for bgn, end in chunks:
+            if window_fetch or any(needs_window(c, notice_type) for c in conditions):
+                params_list.append(notice_type.build_params(service_key, bgn, end))
+            if not window_fetch:
+                params_list.extend(
+                    notice_type.build_params(service_key, bgn, end, c) for c in conditions
+                    if notice_type.has_search_fields(c) and not needs_window(c, notice_type)
+                )
+        prefetch_api_requests(notice_type.api_url, params_list, notice_type.label, workers, notice_type.record_type)
+
+def run_backfill(argv=None):
+    """지정 구간을 여러 조회 구간으로 나누어 재처리 - 실패한 구간이 있으면 1 반환"""
+    args = parse_args(argv)
+    since = datetime.strptime(args.since, TIME_FORMAT)
+    until = datetime.strptime(args.until, TIME_FORMAT)
+    chunks = split_range(since, until, args.chunk_hours)
+
+    notice_types = NOTICE_TYPES
+    if args.types:
+        notice_types = [nt for nt in NOTICE_TYPES if nt.type in args.types]
+
+    names = args.users.split(",") if args.users else None
+    ctx = load_run_context(window=chunks[0] if chunks else (args.since, args.until), names=names)
+    if ctx.read_only:
+        # 재생 모드는 발송 이력·진행 기록을 남기지 않으므로 재처리에 사용할 수 없음
+        ctx.close()
+        print("[재처리] 응답 캐시 재생 모드(RESPONSE_CACHE_REPLAY=1)에서는 실행할 수 없습니다.")
+        return 1
+    # 구간은 재처리 대상으로 고정 (워터마크 미사용)
+    ctx.env_vars['window_mode'] = WINDOW_MODE_BATCH
+    ctx.silent = args.silent
+
+    # 같은 조건(구간·크기·사용자·유형·모드)의 이전 실행이 있으면 이어서 처리
+    state_file = shard_path(BACKFILL_STATE_FILE, ctx.env_vars['shard'])
+    types = ",".join(args.types) if args.types else None
+    run_key = [args.since, args.until, args.chunk_hours, args.users, types, args.silent]
+    state = {'run': run_key, 'completed': []} if args.restart else load_backfill_state(state_file, run_key)
+    completed = set(state['completed'])
+    remaining = [chunk for chunk in chunks if chunk[0] not in completed]
+    mode = "이력만 반영" if args.silent else "알림 발송"
+    print(f"[재처리] {args.since} ~ {args.until}: 전체 {len(chunks)}개 구간 중 {len(remaining)}개 처리 ({mode})")
+
+    failed = []
+    try:
+        for start in range(0, len(remaining), args.parallel):
+            batch = remaining[start:start + args.parallel]
+            reset_request_cache()
+            prefetch_chunks(ctx, notice_types, batch, args.parallel * 2)
+
+            for inqry_bgn_dt, inqry_end_dt in batch:
+                print(f"[재처리] 구간 처리: {inqry_bgn_dt} ~ {inqry_end_dt}")
+                ctx.set_window(inqry_bgn_dt, inqry_end_dt)
+                run_pipeline(notice_types, ctx)
+
+                # 조회 실패 구간은 진행 기록에 남기지 않아 다음 실행에서 다시 처리
+                if ctx.failed_types:
+                    failed.append((inqry_bgn_dt, inqry_end_dt))
+                    continue
+                state['completed'].append(inqry_bgn_dt)
+                save_backfill_state(state, state_file)
+                print(f"[재처리] 진행: {len(state['completed'])}/{len(chunks)}개 구간 완료")
+    finally:
+        reset_request_cache()
+        ctx.close()
+
+    if failed:
+        print(f"[재처리] 조회 실패 구간 {len(failed)}개 - 다시 실행하면 이어서 처리합니다.")
+        return 1
+    print("[재처리] 완료")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(run_backfill())
@@ -0,0 +1,122 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 서비스별 요청 파라미터와 공고 항목 필드 연결 (부분 일치 / 완전 일치)
+SERVICE_FILTERS = {
+    "BidPublicInfoService": {
+        "contains": {"bidNtceNm": "bidNtceNm", "ntceInsttNm": "ntceInsttNm", "dminsttNm": "dminsttNm"},
+        "exact": {},
+    },
+    "HrcspSsstndrdInfoService": {
+        "contains": {"prdctClsfcNoNm": "prdctClsfcNoNm", "ntceInsttNm": "orderInsttNm", "dminsttNm": "rlDminsttNm"},
+        "exact": {},
+    },
+    "ScsbidInfoService": {
+        "contains": {"bidNtceNm": "bidNtceNm"},
+        "exact": {"bidNtceNo": "bidNtceNo"},
+    },
+}
+
+class FakeProcurementApi:
+    """조달청 공공데이터 API 로컬 대역 서버
+
+    서비스별 합성 공고를 페이지 단위로 응답하며,
+    응답 지연(latency)과 오류 비율(error_rate)을 주입할 수 있다.
+    """
+
+    def __init__(self, datasets, latency=0.0, error_rate=0.0, seed=0):
+        self.datasets = datasets
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.server = None
+
+    def _service_of(self, path):
+        """요청 경로의 서비스명"""
+        for service in self.datasets:
+            if service in path:
+                return service
+        return None
+
+    def _filter(self, service, query):
+        """요청 파라미터에 맞는 공고 목록"""
+        filters = SERVICE_FILTERS[service]
+        items = self.datasets[service]
+        for param, field in filters["contains"].items():
+            if query.get(param):
+                items = [i for i in items if query[param] in i.get(field, "")]
+        for param, field in filters["exact"].items():
+            if query.get(param):
+                items = [i for i in items if i.get(field) == query[param]]
+        return items
+
+    def handle(self, path, query):
+        """요청 처리 - (상태 코드, 응답 본문) 반환"""
+        with self.lock:
+            self.calls += 1
+            fail = self.random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if fail:
+            return 503, {"error": "injected"}
+
+        service = self._service_of(path)
+        if service is None:
+            return 404, {"error": "unknown service"}
+
+        items = self._filter(service, query)
+        page_no = int(query.get("pageNo", 1))
+        num_of_rows = int(query.get("numOfRows", 100))
+        page = items[(page_no - 1) * num_of_rows:page_no * num_of_rows]
+        return 200, {
+            "response": {
+                "header": {"resultCode": "00", "resultMsg": "정상"},
+                "body": {
+                    "items": page,
+                    "numOfRows": num_of_rows,
+                    "pageNo": page_no,
+                    "totalCount": len(items),
+                },
+            }
+        }
+
+    def start(self, host="127.0.0.1", port=0):
+        """백그라운드 스레드로 서버 시작 - 기본 URL 반환"""
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                status, body = api.handle(parsed.path, query)
+                raw = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self.server.server_port}"
+
+    def stop(self):
+        """서버 종료"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
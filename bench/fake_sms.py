@@ -0,0 +1,38 @@
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+class FakeMessageService:
+    """SolapiMessageService 대역 - 발송 대신 호출 수와 메시지 수만 기록"""
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.messages = 0
+        self.failed = 0
+
+    def send(self, messages, request_config=None):
+        """솔라피 send 와 같은 형태의 응답 반환"""
+        if not isinstance(messages, list):
+            messages = [messages]
+        if self.latency:
+            time.sleep(self.latency)
+
+        failed_list = []
+        with self.lock:
+            self.calls += 1
+            self.messages += len(messages)
+            for message in messages:
+                if self.random.random() < self.failure_rate:
+                    failed_list.append(SimpleNamespace(to=message.to, custom_fields=message.custom_fields))
+            self.failed += len(failed_list)
+            group_id = f"FAKE{self.calls:08d}"
+
+        return SimpleNamespace(
+            group_info=SimpleNamespace(group_id=group_id),
+            failed_message_list=failed_list,
+        )
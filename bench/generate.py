@@ -0,0 +1,95 @@
+import random
+
+# 합성 데이터용 어휘
+WORDS = [
+    "CCTV", "영상", "감시", "네트워크", "서버", "소프트웨어", "유지보수", "구축", "통신", "보안",
+    "방송", "전산", "정보화", "클라우드", "데이터", "시스템", "장비", "공사", "설계", "용역",
+    "교통", "안전", "재난", "스마트", "조명", "전기", "소방", "상수도", "도로", "교육",
+]
+ORG_COUNT = 300
+
+def make_name(rng, index):
+    """합성 공고명"""
+    return " ".join(rng.sample(WORDS, 3)) + f" {index}"
+
+def make_org(rng):
+    """합성 기관명"""
+    return f"기관{rng.randrange(ORG_COUNT):03d}"
+
+def generate_datasets(notice_count, seed=0):
+    """서비스별 합성 공고 목록 생성"""
+    rng = random.Random(seed)
+    bid, pre, award = [], [], []
+    for i in range(notice_count):
+        bid_no = f"R{i:011d}"
+        name = make_name(rng, i)
+        bid.append({
+            "bidNtceNo": bid_no,
+            "bidNtceNm": name,
+            "ntceInsttNm": make_org(rng),
+            "dminsttNm": make_org(rng),
+            "bidNtceDt": "2026-01-01 10:00:00",
+            "bidClseDt": "2026-01-15 10:00:00",
+            "presmptPrce": str(rng.randrange(1, 1000) * 1000000),
+            "bidNtceDtlUrl": f"https://www.g2b.go.kr/{bid_no}",
+        })
+        pre.append({
+            "bfSpecRgstNo": f"P{i:08d}",
+            "prdctClsfcNoNm": make_name(rng, i),
+            "orderInsttNm": make_org(rng),
+            "rlDminsttNm": make_org(rng),
+            "asignBdgtAmt": str(rng.randrange(1, 1000) * 1000000),
+            "rcptDt": "2026-01-01 10:00:00",
+            "opninRgstClseDt": "2026-01-08 18:00:00",
+        })
+        award.append({
+            "bidNtceNo": bid_no,
+            "bidNtceNm": name,
+            "bidwinnrNm": f"업체{rng.randrange(1000):04d}",
+            "fnlSucsfDate": "2026-01-20",
+        })
+    return {
+        "BidPublicInfoService": bid,
+        "HrcspSsstndrdInfoService": pre,
+        "ScsbidInfoService": award,
+    }
+
+def make_condition(rng, notice_type, datasets):
+    """합성 검색 조건 - 인기 키워드에 몰리도록 앞쪽 어휘를 더 자주 선택"""
+    keyword = WORDS[min(int(rng.expovariate(0.25)), len(WORDS) - 1)]
+    condition = {"type": notice_type, "keyword": keyword}
+    if notice_type == "award":
+        if rng.random() < 0.3:
+            condition = {"type": notice_type, "notice_number": rng.choice(datasets["ScsbidInfoService"])["bidNtceNo"]}
+    elif rng.random() < 0.3:
+        condition["demand_org"] = make_org(rng)
+    return condition
+
+def generate_users(user_count, datasets, conditions_per_user=3, seed=0):
+    """합성 사용자 목록 생성"""
+    rng = random.Random(seed)
+    users = []
+    for i in range(user_count):
+        users.append({
+            "name": f"user{i:06d}",
+            "phone": f"010{i:08d}",
+            "search_conditions": [
+                make_condition(rng, rng.choice(("bid", "pre", "award")), datasets)
+                for _ in range(conditions_per_user)
+            ],
+        })
+    return users
+
+def generate_history(users, datasets, entries_per_user=10, seed=0):
+    """합성 발송 이력 생성 (sent_notifications.json 형식)"""
+    rng = random.Random(seed)
+    bid = datasets["BidPublicInfoService"]
+    pre = datasets["HrcspSsstndrdInfoService"]
+    history = {}
+    for user in users:
+        history[user["name"]] = {
+            "bid_notices": [rng.choice(bid)["bidNtceNo"] for _ in range(entries_per_user)],
+            "pre_notices": [rng.choice(pre)["bfSpecRgstNo"] for _ in range(entries_per_user)],
+            "award_notices": [rng.choice(bid)["bidNtceNo"] for _ in range(entries_per_user)],
+        }
+    return history
@@ -0,0 +1,212 @@
+"""오프라인 벤치마크
+
+로컬 API 대역 서버와 가짜 문자 발송 서비스로 알림 파이프라인 전체를 실행하고
+단계별 소요 시간, API 호출 수, 최대 메모리와 main.py 시작 시간(cold start)을 측정한다.
+
+    python -m bench.run_bench --users 10000 --notices 100000 --fetch-mode window
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime
+
+from bench.fake_api import FakeProcurementApi
+from bench.fake_sms import FakeMessageService
+from bench.generate import generate_datasets, generate_history, generate_users
+
+RESULTS_FILE = "bench_results.jsonl"
+
+class StageTimer:
+    """단계별 소요 시간 및 최대 메모리 측정"""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            record = self.stages.setdefault(name, {"seconds": 0.0, "peak_mb": 0.0})
+            record["seconds"] += elapsed
+            record["peak_mb"] = max(record["peak_mb"], peak / 1024 / 1024)
+
+def parse_args(argv=None):
+    """명령행 인자 해석"""
+    parser = argparse.ArgumentParser(description="공고 알림 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--notices", type=int, default=10000)
+    parser.add_argument("--conditions-per-user", type=int, default=3)
+    parser.add_argument("--history-per-user", type=int, default=10)
+    parser.add_argument("--fetch-mode", choices=("condition", "window"), default="window")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--history-backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--api-latency-ms", type=float, default=0.0)
+    parser.add_argument("--api-error-rate", type=float, default=0.0)
+    parser.add_argument("--sms-latency-ms", type=float, default=0.0)
+    parser.add_argument("--sms-failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cold-start-runs", type=int, default=3, help="시작 시간 측정 반복 횟수 (0 이면 측정 안 함)")
+    parser.add_argument("--output", default=RESULTS_FILE, help="결과를 누적 기록할 JSONL 파일")
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 출력 표시")
+    return parser.parse_args(argv)
+
+def run_benchmark(args):
+    """벤치마크 1회 실행 - 결과 dict 반환"""
+    # 실행 환경 설정 (작업 디렉터리의 users.json / 발송 이력 파일 사용)
+    os.environ.update({
+        "FETCH_MODE": args.fetch_mode,
+        "CONCURRENCY": str(args.concurrency),
+        "HISTORY_BACKEND": args.history_backend,
+        "WINDOW_MODE": "batch",
+        "API_RATE_LIMIT": "0",
+        "API_MAX_RETRIES": "3",
+        "RESPONSE_CACHE": "0",
+    })
+
+    import common
+    from pipeline import RunContext, process_notice_type
+    from history import open_sent_history
+    from subscribers import JsonSubscriberStore
+    from main import NOTICE_TYPES
+
+    # 필요할 때 import 되는 HTTP·문자 발송 모듈은 미리 로딩하여 단계별 메모리 측정에서 제외
+    import api_client
+    import solapi.model
+
+    timer = StageTimer()
+    tracemalloc.start()
+
+    with timer.stage("generate"):
+        datasets = generate_datasets(args.notices, seed=args.seed)
+        users = generate_users(args.users, datasets, args.conditions_per_user, seed=args.seed)
+        history = generate_history(users, datasets, args.history_per_user, seed=args.seed)
+        with open(common.USERS_FILE, "w", encoding="utf-8") as f:
+            json.dump(users, f, ensure_ascii=False)
+        common.save_sent_data(history)
+        del users, history
+
+    cold_start = measure_cold_start(args.cold_start_runs) if args.cold_start_runs > 0 else {}
+
+    api = FakeProcurementApi(datasets, latency=args.api_latency_ms / 1000, error_rate=args.api_error_rate, seed=args.seed)
+    base_url = api.start()
+    notice_types = [
+        replace(nt, api_url=f"{base_url}/{urlpath_of(nt.api_url)}") for nt in NOTICE_TYPES
+    ]
+    sms = FakeMessageService(latency=args.sms_latency_ms / 1000, failure_rate=args.sms_failure_rate, seed=args.seed)
+    common.reset_request_cache()
+
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        with timer.stage("load"):
+            env_vars = common.load_environment()
+            env_vars['coolsms_sender'] = "01000000000"
+            ctx = RunContext(
+                env_vars=env_vars,
+                subscribers=JsonSubscriberStore(),
+                history=open_sent_history(),
+                message_service=sms,
+                inqry_bgn_dt="202601010000",
+                inqry_end_dt="202601020000",
+            )
+            if env_vars['concurrency'] > 1:
+                common.set_api_concurrency(env_vars['concurrency'])
+
+        for notice_type in notice_types:
+            with timer.stage(f"fetch_match:{notice_type.type}"):
+                process_notice_type(ctx, notice_type)
+
+        with timer.stage("send"):
+            accepted = ctx.delivery_queue.flush()
+
+        with timer.stage("save"):
+            ctx.history.commit()
+            ctx.history.close()
+
+    _, overall_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    api.stop()
+    client_stats = common.get_api_client().stats
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "verbose")},
+        "stages": timer.stages,
+        "total_seconds": sum(s["seconds"] for name, s in timer.stages.items() if name != "generate"),
+        "api_calls": api.calls,
+        "api_errors_injected": api.errors,
+        "api_retries": client_stats["retries"],
+        "sms_calls": sms.calls,
+        "sms_messages": sms.messages,
+        "notifications_accepted": dict(accepted),
+        "peak_traced_mb": overall_peak / 1024 / 1024,
+        "cold_start_seconds": cold_start,
+    }
+
+def measure_cold_start(runs):
+    """새 프로세스의 main 모듈 import 와 --dry-run 실행 소요 시간(초) - 각각 runs 회 중 최솟값"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    commands = {
+        "import": [sys.executable, "-c", "import main"],
+        "dry_run": [sys.executable, os.path.join(root, "main.py"), "--dry-run"],
+    }
+    timings = {}
+    for name, command in commands.items():
+        elapsed = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            elapsed.append(time.perf_counter() - start)
+        timings[name] = min(elapsed)
+    return timings
+
+def urlpath_of(api_url):
+    """실제 API URL 에서 서비스 경로 부분 추출"""
+    return api_url.split("/1230000/", 1)[-1]
+
+def print_report(result):
+    """결과 요약 출력"""
+    print(f"[벤치마크] {result['params']}")
+    for name, stage in result["stages"].items():
+        print(f"  {name:<22} {stage['seconds']:9.3f}초  peak {stage['peak_mb']:8.1f}MB")
+    print(f"  {'total (generate 제외)':<22} {result['total_seconds']:9.3f}초")
+    print(
+        f"  API 호출 {result['api_calls']}건 (주입 오류 {result['api_errors_injected']}건, 재시도 {result['api_retries']}건), "
+        f"문자 API 호출 {result['sms_calls']}건 / 메시지 {result['sms_messages']}건"
+    )
+    print(f"  발송 접수 {result['notifications_accepted']}, 최대 추적 메모리 {result['peak_traced_mb']:.1f}MB")
+    cold_start = result["cold_start_seconds"]
+    if cold_start:
+        print(f"  시작 시간 import {cold_start['import']:.3f}초, --dry-run {cold_start['dry_run']:.3f}초")
+
+def main(argv=None):
+    """벤치마크 실행 및 결과 기록"""
+    args = parse_args(argv)
+    output = os.path.abspath(args.output)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bid-bench-") as workdir:
+        os.chdir(workdir)
+        try:
+            result = run_benchmark(args)
+        finally:
+            os.chdir(cwd)
+
+    print_report(result)
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,78 @@
 import json
 import os
-import requests
-from dotenv import load_dotenv
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from solapi.model import RequestMessage
+from response_cache import RESPONSE_CACHE_DIR, ResponseCache
 
 # 상수 정의
 BATCH_TIMES = [9, 12, 15, 18]
 SENT_FILE = "sent_notifications.json"
 USERS_FILE = "users.json"
+PAGE_SIZE = 100
+PAGE_FETCH_WORKERS = 4
+# 조회 구간·상태 파일 시각 형식
+TIME_FORMAT = "%Y%m%d%H%M"
+
+# 조회 방식: 조건별 API 요청(condition) 또는 구간 전체 조회 후 로컬 매칭(window)
+FETCH_MODE_CONDITION = "condition"
+FETCH_MODE_WINDOW = "window"
+
+# 조회 구간: 배치 시각 고정 구간(batch) 또는 공고 유형별 워터마크 기준 구간(watermark)
+WINDOW_MODE_BATCH = "batch"
+WINDOW_MODE_WATERMARK = "watermark"
+
+# 실행 단위 요청 캐시: 동일 조회는 한 번만 요청하고 결과를 구독자 모두에게 공유
+_request_cache = {}
+_request_cache_stats = {"hits": 0, "misses": 0}
+# 미리 적재한 뒤 아직 사용되지 않은 조회 (첫 사용은 재사용으로 집계하지 않음)
+_prefetched_keys = set()
+
+# 동시 실행 모드의 동시 API 요청 수 제한 (None 이면 제한 없음)
+_api_slots = None
+
+# 공용 API 클라이언트 (연결 풀 및 재시도/속도 제한 상태 공유)
+# requests·solapi·dotenv 는 필요한 시점에 import 하여 시작 시간을 줄인다
+_api_client = None
+_api_client_lock = threading.Lock()
+
+class ApiRequestError(Exception):
+    """공공데이터 API 요청 실패"""
 
 def load_environment():
     """환경변수 로딩"""
+    from dotenv import load_dotenv
     load_dotenv()
     return {
         'service_key': os.getenv('SERVICE_KEY'),
         'coolsms_api_key': os.getenv('COOLSMS_API_KEY'),
         'coolsms_api_secret': os.getenv('COOLSMS_API_SECRET'),
-        'coolsms_sender': os.getenv('COOLSMS_SENDER')
+        'coolsms_sender': os.getenv('COOLSMS_SENDER'),
+        'fetch_mode': os.getenv('FETCH_MODE', FETCH_MODE_CONDITION),
+        'concurrency': max(1, int(os.getenv('CONCURRENCY', '1'))),
+        'window_mode': os.getenv('WINDOW_MODE', WINDOW_MODE_BATCH),
+        'watermark_max_lookback_days': int(os.getenv('WATERMARK_MAX_LOOKBACK_DAYS', '7')),
+        'metrics_file': os.getenv('METRICS_FILE'),
+        'shard': os.getenv('SHARD'),
+        'run_time': os.getenv('RUN_TIME'),
+        'replay': os.getenv('RESPONSE_CACHE_REPLAY') == '1',
+        'digest': os.getenv('DIGEST') == '1',
+        'digest_result_limit': int(os.getenv('DIGEST_RESULT_LIMIT', '100')),
+        'award_followup': os.getenv('AWARD_FOLLOWUP') == '1',
+        'award_followup_lookback_days': int(os.getenv('AWARD_FOLLOWUP_LOOKBACK_DAYS', '30')),
+        'award_followup_max_days': int(os.getenv('AWARD_FOLLOWUP_MAX_DAYS', '90')),
+        'event_log': os.getenv('EVENT_LOG'),
+        'event_level': os.getenv('EVENT_LEVEL', 'info'),
+        'event_sample_rate': float(os.getenv('EVENT_SAMPLE_RATE', '1'))
     }
 
+def current_time(env_vars):
+    """실행 기준 시각 - RUN_TIME(YYYYMMDDHHMM) 지정 시 그 시각 (샤드 작업 프로세스가 같은 구간을 조회)"""
+    if env_vars.get('run_time'):
+        return datetime.strptime(env_vars['run_time'], TIME_FORMAT)
+    return datetime.now()
+
 def get_batch_time_ranges(now):
     """배치 시간대 설정 함수"""
     valid_times = [h for h in BATCH_TIMES if h <= now.hour]
@@ -30,7 +83,7 @@ def get_batch_time_ranges(now):
         # 전날 마지막 배치 시각부터 오늘 첫 배치 시각까지
         bgn = prev_day.replace(hour=BATCH_TIMES[-1], minute=0, second=0, microsecond=0)
         end = now.replace(hour=BATCH_TIMES[0], minute=0, second=0, microsecond=0)
-        return bgn.strftime("%Y%m%d%H%M"), end.strftime("%Y%m%d%H%M")
+        return bgn.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT)
 
     # case 2: 현재 시각이 배치 시간 이후일 경우
     # 가장 가까운 이전 배치 구간 반환
@@ -45,7 +98,17 @@ def get_batch_time_ranges(now):
         bgn = now.replace(hour=BATCH_TIMES[idx-1], minute=0, second=0, microsecond=0)
 
     end = now.replace(hour=prev_batch_hour, minute=0, second=0, microsecond=0)
-    return bgn.strftime("%Y%m%d%H%M"), end.strftime("%Y%m%d%H%M")
+    return bgn.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT)
+
+def iter_batch_windows(since, until):
+    """since 이후 until 까지 도래한 배치 시각별 조회 구간 목록"""
+    day = since.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day <= until:
+        for hour in BATCH_TIMES:
+            batch_at = day.replace(hour=hour)
+            if since < batch_at <= until:
+                yield get_batch_time_ranges(batch_at)
+        day += timedelta(days=1)
 
 def make_sms_text_compact(prefix, content_name):
     """간결한 SMS 메시지 내용 생성"""
@@ -54,88 +117,197 @@ def make_sms_text_compact(prefix, content_name):
         content_name = content_name[:max_length - 3] + "..."
     return prefix + content_name
 
-def send_message(message_service, sender_phone, recipient_phone, message_text):
-    """단일 메시지 전송 함수"""
-    try:
-        message = RequestMessage(
-            from_=sender_phone,
-            to=recipient_phone,
-            text=message_text,
-        )
-        res = message_service.send(message)
-        print(f"문자 발송 완료 (Group ID: {res.group_info.group_id})")
-        return True
-    except Exception as e:
-        print(f"문자 발송 실패: {str(e)}")
-        return False
-
-def load_sent_data():
-    """발송 이력 로딩"""
-    if os.path.exists(SENT_FILE):
-        with open(SENT_FILE, 'r', encoding="utf-8") as f:
+def load_json(path):
+    """JSON 상태 파일 로딩 - 없으면 빈 dict"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding="utf-8") as f:
             return json.load(f)
     return {}
 
-def save_sent_data(sent_data):
-    """발송 이력 저장"""
-    with open(SENT_FILE, 'w', encoding="utf-8") as f:
-        json.dump(sent_data, f, indent=2, ensure_ascii=False)
+def save_json(data, path):
+    """JSON 상태 파일 저장 (임시 파일 작성 후 교체)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
 
-def load_users():
-    """사용자 정보 로딩"""
-    with open(USERS_FILE, 'r', encoding="utf-8") as f:
-        return json.load(f)
+def load_sent_data(path=SENT_FILE):
+    """발송 이력 로딩"""
+    return load_json(path)
+
+def save_sent_data(sent_data, path=SENT_FILE):
+    """발송 이력 저장 (임시 파일 작성 후 교체)"""
+    save_json(sent_data, path)
 
 def build_search_description(keyword=None, notice_org=None, demand_org=None, number=None):
-    """검색 조건 설명 생성"""
+    """검색 조건 설명 생성 (목록 값은 | 로 연결)"""
     search_parts = []
-    if keyword:
-        search_parts.append(f"키워드='{keyword}'")
-    if notice_org:
-        search_parts.append(f"공고기관='{notice_org}'")
-    if demand_org:
-        search_parts.append(f"수요기관='{demand_org}'")
-    if number:
-        search_parts.append(f"공고번호='{number}'")
+    for label, value in (("키워드", keyword), ("공고기관", notice_org), ("수요기관", demand_org), ("공고번호", number)):
+        if isinstance(value, (list, tuple)):
+            value = "|".join(str(v) for v in value if v)
+        if value:
+            search_parts.append(f"{label}='{value}'")
     return " + ".join(search_parts)
 
-def make_api_request(api_url, params, name, search_desc):
-    """API 요청 및 응답 처리"""
-    response = requests.get(api_url, params=params)
-    print(f"요청 URL: {response.request.url}")
-
-    if response.status_code != 200:
-        print(f"API 오류 발생: {response.status_code}")
-        print(response.text)
+def create_response_cache():
+    """RESPONSE_CACHE 설정 시 원본 응답 디스크 캐시 생성"""
+    replay = os.getenv('RESPONSE_CACHE_REPLAY') == '1'
+    if os.getenv('RESPONSE_CACHE') != '1' and not replay:
         return None
+    return ResponseCache(
+        os.getenv('RESPONSE_CACHE_DIR', RESPONSE_CACHE_DIR),
+        max_bytes=int(os.getenv('RESPONSE_CACHE_MAX_MB', '200')) * 1024 * 1024,
+        max_age_seconds=int(os.getenv('RESPONSE_CACHE_MAX_AGE_HOURS', '24')) * 3600,
+        replay=replay,
+    )
 
-    try:
-        data = response.json()
+def get_api_client():
+    """공용 API 클라이언트 반환 (최초 호출 시 생성)"""
+    global _api_client
+    with _api_client_lock:
+        if _api_client is None:
+            from api_client import ApiClient
+            _api_client = ApiClient(
+                rate_limit=float(os.getenv('API_RATE_LIMIT', '20')),
+                timeout=float(os.getenv('API_TIMEOUT', '10')),
+                max_retries=int(os.getenv('API_MAX_RETRIES', '3')),
+                response_cache=create_response_cache(),
+            )
+        return _api_client
 
-        # API 에러 응답 체크
-        if "nkoneps.com.response.ResponseError" in data:
-            error_info = data["nkoneps.com.response.ResponseError"]["header"]
-            error_code = error_info.get("resultCode")
-            error_msg = error_info.get("resultMsg")
-            print(f"[{name}] API 오류 발생 - 코드: {error_code}, 메시지: {error_msg}")
-            return None
+def print_api_client_stats():
+    """API 클라이언트 통계 출력"""
+    if _api_client is not None:
+        _api_client.print_stats()
 
-        # 정상 응답 처리
-        items = data.get("response", {}).get("body", {}).get("items", [])
-        print(f"[{name}] 조회 {search_desc} 결과:")
+def request_api_page(api_url, params, name, record_type=None):
+    """API 단일 페이지 요청 - (레코드 목록, 전체 건수) 반환, 실패 시 None"""
+    with _api_slots or nullcontext():
+        return get_api_client().get_page(api_url, params, name, record_type)
 
-        if not items:
-            print("조회된 데이터가 없습니다.")
-            return []
+def make_request_key(api_url, params):
+    """요청 캐시 키 생성 (ServiceKey·페이지 파라미터 제외, 파라미터 정규화)"""
+    normalized = tuple(sorted(
+        (key, str(value).strip())
+        for key, value in params.items()
+        if key not in ("ServiceKey", "pageNo", "numOfRows")
+        and value is not None and str(value).strip() != ""
+    ))
+    return api_url, normalized
 
-        return items
+def get_cached_request(key):
+    """캐시된 조회 결과 반환 - 없으면 None"""
+    if key in _request_cache:
+        if key in _prefetched_keys:
+            # 미리 적재한 결과의 첫 사용 - 적재 시 실제 요청으로 이미 집계됨
+            _prefetched_keys.discard(key)
+        else:
+            _request_cache_stats["hits"] += 1
+        return _request_cache[key]
+    _request_cache_stats["misses"] += 1
+    return None
 
-    except (ValueError, KeyError) as e:
-        print(f"[{name}] JSON 파싱 오류")
+def reset_request_cache():
+    """요청 캐시 및 통계 초기화"""
+    _request_cache.clear()
+    _prefetched_keys.clear()
+    _request_cache_stats["hits"] = 0
+    _request_cache_stats["misses"] = 0
+
+def print_request_cache_stats():
+    """요청 캐시 적중률 출력"""
+    hits = _request_cache_stats["hits"]
+    total = hits + _request_cache_stats["misses"]
+    if total == 0:
+        return
+    print(f"[요청 캐시] 조회 {total}건 중 {hits}건 재사용, 실제 요청 {total - hits}건 (적중률 {hits / total:.1%})")
+
+def iter_api_items(api_url, params, name, record_type=None):
+    """전체 페이지 항목 스트림
+
+    첫 페이지의 totalCount 로 전체 페이지 수를 계산하고, 나머지 페이지는
+    PAGE_FETCH_WORKERS 개 작업자로 병렬 요청한다. 항목은 페이지 순서대로
+    도착 즉시 전달되며, 요청 실패 시 ApiRequestError 가 발생한다.
+    record_type 이 주어지면 항목을 해당 레코드로 변환하여 필요한 필드만 보관한다.
+    """
+    key = make_request_key(api_url, params)
+    cached = get_cached_request(key)
+    if cached is not None:
+        yield from cached
+        return
+
+    page_params = dict(params, pageNo=1, numOfRows=PAGE_SIZE)
+    result = request_api_page(api_url, page_params, name, record_type)
+    if result is None:
+        raise ApiRequestError(f"[{name}] 1페이지 요청 실패")
+
+    items, total_count = result
+    all_items = list(items)
+    yield from items
+
+    last_page = max(1, -(-total_count // PAGE_SIZE))
+    if last_page > 1:
+        executor = ThreadPoolExecutor(max_workers=min(PAGE_FETCH_WORKERS, last_page - 1))
+        try:
+            futures = [
+                executor.submit(request_api_page, api_url, dict(page_params, pageNo=page_no), name, record_type)
+                for page_no in range(2, last_page + 1)
+            ]
+            for page_no, future in enumerate(futures, start=2):
+                result = future.result()
+                if result is None:
+                    raise ApiRequestError(f"[{name}] {page_no}페이지 요청 실패")
+                all_items.extend(result[0])
+                yield from result[0]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    _request_cache[key] = all_items
+
+def make_api_request(api_url, params, name, search_desc, record_type=None):
+    """API 요청 및 응답 처리 (전체 페이지)"""
+    try:
+        items = list(iter_api_items(api_url, params, name, record_type))
+    except ApiRequestError as e:
+        print(str(e))
         return None
 
-def check_result_limit_and_notify(items, message_service, sender_phone, recipient_phone, search_desc, limit=5):
-    """결과 개수 제한 체크 및 제한 메시지 발송"""
+    print(f"[{name}] 조회 {search_desc} 결과:")
+
+    if not items:
+        print("조회된 데이터가 없습니다.")
+        return []
+
+    return items
+
+def set_api_concurrency(limit):
+    """동시 API 요청 수 제한 설정 - limit 이 1 이하이면 제한 해제"""
+    global _api_slots
+    _api_slots = threading.BoundedSemaphore(limit) if limit > 1 else None
+
+def prefetch_api_requests(api_url, params_list, name, max_workers, record_type=None):
+    """서로 다른 조회를 병렬 요청하여 요청 캐시에 미리 적재 - 조회된 항목 수 반환"""
+    unique_params = {}
+    for params in params_list:
+        unique_params.setdefault(make_request_key(api_url, params), params)
+
+    def fetch(key, params):
+        try:
+            count = sum(1 for _ in iter_api_items(api_url, params, name, record_type))
+        except ApiRequestError as e:
+            # 실패한 조회는 캐시되지 않으므로 본 처리 단계에서 다시 요청됨
+            print(str(e))
+            return 0
+        _prefetched_keys.add(key)
+        return count
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        fetched = sum(executor.map(fetch, unique_params.keys(), unique_params.values()))
+    print(f"[{name}] 조회 {len(unique_params)}건 요청 완료")
+    return fetched
+
+def check_result_limit_and_notify(items, delivery_queue, recipient_phone, search_desc, limit=5):
+    """결과 개수 제한 체크 및 제한 메시지 발송 대기열 등록"""
     if len(items) > limit:
         limit_msg = (
             f"[공고 알림]\n"
@@ -144,7 +316,7 @@ def check_result_limit_and_notify(items, message_service, sender_phone, recipien
             f"조회조건을 더 구체적으로 설정해주세요.\n"
         )
 
-        if send_message(message_service, sender_phone, recipient_phone, limit_msg):
-            print(f"제한 메시지 전송 완료: {len(items)}개 결과")
+        delivery_queue.add(recipient_phone, limit_msg)
+        print(f"제한 메시지 발송 대기: {len(items)}개 결과")
         return True
     return False
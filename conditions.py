@@ -0,0 +1,124 @@
+import json
+from datetime import datetime
+from matcher import AhoCorasick, as_list, normalize_text
+
+# 검색 조건 형식
+#   keyword / notice_org / demand_org / notice_number : 문자열 또는 목록(OR)
+#   exclude            : 키워드 필드에 포함되면 제외할 단어 (문자열 또는 목록)
+#   min_price / max_price : 가격 필드(입찰 presmptPrce, 사전 asignBdgtAmt) 범위
+#   min_hours_to_close : 마감 일시(입찰 bidClseDt, 사전 opninRgstClseDt)까지 남은 최소 시간
+FILTER_KEYS = ("exclude", "min_price", "max_price", "min_hours_to_close")
+DATETIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y%m%d%H%M%S", "%Y%m%d%H%M")
+
+def parse_number(value):
+    """금액 문자열을 숫자로 변환 - 변환할 수 없으면 None"""
+    try:
+        return float(str(value).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+def parse_datetime(value):
+    """일시 문자열 변환 - 변환할 수 없으면 None"""
+    if not value:
+        return None
+    for fmt in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+def normalize_condition(condition):
+    """검색 조건 정규화 - 빈 값 제거, 문자열 정규화, OR 목록 정렬"""
+    normalized = {}
+    for key, value in condition.items():
+        if isinstance(value, (list, tuple)):
+            value = sorted({normalize_text(v) for v in as_list(value)})
+            if len(value) == 1:
+                value = value[0]
+        elif isinstance(value, str):
+            value = normalize_text(value)
+        if value or value == 0:
+            normalized[key] = value
+    return normalized
+
+def condition_key(condition):
+    """같은 검색 조건을 가진 사용자끼리 결과를 공유하기 위한 키 (정규화한 조건)"""
+    return json.dumps(normalize_condition(condition), sort_keys=True, ensure_ascii=False)
+
+def needs_window(condition, notice_type):
+    """API 요청 파라미터로 표현할 수 없는 조건(OR 목록) 여부 - 구간 전체 조회 후 로컬 매칭"""
+    return any(
+        isinstance(condition.get(key), (list, tuple)) and len(as_list(condition.get(key))) > 1
+        for key in notice_type.param_map
+    )
+
+def describe_filters(condition):
+    """로컬 필터 조건 설명"""
+    parts = []
+    excludes = as_list(condition.get("exclude"))
+    if excludes:
+        parts.append(f"제외='{'|'.join(excludes)}'")
+    min_price, max_price = condition.get("min_price"), condition.get("max_price")
+    if min_price is not None or max_price is not None:
+        parts.append(f"금액={min_price or ''}~{max_price or ''}")
+    if condition.get("min_hours_to_close"):
+        parts.append(f"마감까지 {condition['min_hours_to_close']}시간 이상")
+    return " + ".join(parts)
+
+class CompiledCondition:
+    """실행 단위로 한 번 컴파일한 검색 조건 (로컬 필터 술어 목록)"""
+    __slots__ = ("condition", "predicates")
+
+    def __init__(self, condition, predicates):
+        self.condition = condition
+        self.predicates = predicates
+
+    def accepts(self, item):
+        """공고 항목이 모든 로컬 필터를 통과하는지 확인"""
+        for predicate in self.predicates:
+            if not predicate(item):
+                return False
+        return True
+
+    def filter(self, items):
+        """로컬 필터를 통과한 공고 목록"""
+        if not self.predicates:
+            return items
+        return [item for item in items if self.accepts(item)]
+
+def compile_condition(condition, notice_type, now=None):
+    """검색 조건의 로컬 필터를 술어로 컴파일 - 공고 유형에 없는 필드의 필터는 무시"""
+    now = now or datetime.now()
+    predicates = []
+
+    # 제외어: 키워드 필드에 하나라도 포함되면 제외
+    excludes = {normalize_text(v) for v in as_list(condition.get("exclude"))}
+    keyword_field = notice_type.match_fields.get("keyword")
+    if excludes and keyword_field:
+        automaton = AhoCorasick(excludes)
+        predicates.append(lambda item: not automaton.find(normalize_text(item.get(keyword_field))))
+
+    # 금액 범위: 금액이 없거나 숫자가 아니면 제외
+    min_price = parse_number(condition.get("min_price"))
+    max_price = parse_number(condition.get("max_price"))
+    price_field = notice_type.price_field
+    if (min_price is not None or max_price is not None) and price_field:
+        low = min_price if min_price is not None else float("-inf")
+        high = max_price if max_price is not None else float("inf")
+
+        def price_in_range(item):
+            price = parse_number(item.get(price_field))
+            return price is not None and low <= price <= high
+        predicates.append(price_in_range)
+
+    # 마감까지 남은 시간: 마감 일시를 알 수 없으면 제외
+    min_hours = parse_number(condition.get("min_hours_to_close"))
+    deadline_field = notice_type.deadline_field
+    if min_hours and deadline_field:
+        def closes_late_enough(item):
+            deadline = parse_datetime(item.get(deadline_field))
+            return deadline is not None and (deadline - now).total_seconds() >= min_hours * 3600
+        predicates.append(closes_late_enough)
+
+    return CompiledCondition(condition, predicates)
@@ -0,0 +1,135 @@
+import os
+import signal
+import threading
+from datetime import datetime, timedelta
+from common import TIME_FORMAT, USERS_FILE, WINDOW_MODE_WATERMARK, get_batch_time_ranges, iter_batch_windows, load_json, reset_request_cache, save_json
+from pipeline import load_run_context, run_pipeline
+from main import NOTICE_TYPES
+from metrics import METRICS
+from sharding import shard_path
+
+# 데몬 설정
+DAEMON_STATE_FILE = "daemon_state.json"
+CHECK_INTERVAL_SECONDS = 30
+
+def load_daemon_state(path=DAEMON_STATE_FILE):
+    """데몬 상태(마지막 처리 구간) 로딩"""
+    return load_json(path)
+
+def save_daemon_state(state, path=DAEMON_STATE_FILE):
+    """데몬 상태 저장 (임시 파일 작성 후 교체)"""
+    save_json(state, path)
+
+def due_windows(last_end, now, interval_minutes, max_catchup_days):
+    """처리할 조회 구간 목록 - 중단 기간에 놓친 구간 포함"""
+    if last_end is not None:
+        last_end = max(last_end, now - timedelta(days=max_catchup_days))
+
+    # 짧은 주기 모드: 마지막 처리 시각부터 현재(주기 단위 절사)까지 한 구간
+    if interval_minutes > 0:
+        end = now.replace(second=0, microsecond=0)
+        end -= timedelta(minutes=end.minute % interval_minutes)
+        bgn = last_end or end - timedelta(minutes=interval_minutes)
+        if end <= bgn:
+            return []
+        return [(bgn.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT))]
+
+    # 배치 시각 모드: 첫 실행은 직전 배치 구간, 이후는 도래한 배치 구간 모두
+    if last_end is None:
+        return [get_batch_time_ranges(now)]
+    return list(iter_batch_windows(last_end, now))
+
+def get_mtime(path):
+    """파일 수정 시각 (없으면 None)"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def run_daemon():
+    """상주 실행 - 연결·사용자·발송 이력을 유지하며 일정에 따라 알림 처리 (응답 캐시 재생 모드이면 1 반환)"""
+    interval_minutes = int(os.getenv('DAEMON_INTERVAL_MINUTES', '0'))
+    max_catchup_days = int(os.getenv('DAEMON_MAX_CATCHUP_DAYS', '7'))
+
+    ctx = load_run_context()
+    if ctx.read_only:
+        # 재생 모드는 상태 파일을 갱신하지 않으므로 같은 구간을 반복 처리하게 됨
+        ctx.close()
+        print("[데몬] 응답 캐시 재생 모드(RESPONSE_CACHE_REPLAY=1)는 main.py 로 실행하세요.")
+        return 1
+
+    # METRICS_PORT 설정 시 /metrics 엔드포인트 제공
+    metrics_port = os.getenv('METRICS_PORT')
+    if metrics_port:
+        METRICS.serve(int(metrics_port))
+
+    # SHARD 설정 시 샤드별 상태 파일 사용
+    shard = ctx.env_vars['shard']
+    state_file = shard_path(DAEMON_STATE_FILE, shard)
+
+    users_file = os.getenv('USERS_FILE', USERS_FILE)
+    users_mtime = get_mtime(users_file)
+    state = load_daemon_state(state_file)
+    schedule = f"{interval_minutes}분 주기" if interval_minutes > 0 else "배치 시각"
+    print(f"[데몬] 시작 ({schedule})")
+
+    # SIGTERM 수신 시 진행 중인 주기를 마치고 종료
+    stopping = threading.Event()
+
+    def request_stop(signum, frame):
+        print("[데몬] 종료 신호 수신 - 현재 주기 완료 후 종료")
+        stopping.set()
+    signal.signal(signal.SIGTERM, request_stop)
+
+    try:
+        while not stopping.is_set():
+            now = datetime.now()
+
+            try:
+                # users.json 변경 시 사용자 정보 다시 로딩 (실패하면 기존 색인 유지 후 다음 주기에 재시도)
+                mtime = get_mtime(users_file)
+                if mtime != users_mtime:
+                    user_count = ctx.subscribers.reload()
+                    users_mtime = mtime
+                    print(f"[데몬] 사용자 정보 다시 로딩: {user_count}명")
+
+                last_end = state.get('last_window_end')
+                last_end = datetime.strptime(last_end, TIME_FORMAT) if last_end else None
+
+                windows = due_windows(last_end, now, interval_minutes, max_catchup_days)
+
+                # 워터마크 모드는 실행마다 놓친 구간까지 한 번에 조회하므로 마지막 구간만 실행
+                if ctx.env_vars['window_mode'] == WINDOW_MODE_WATERMARK:
+                    windows = windows[-1:]
+
+                for inqry_bgn_dt, inqry_end_dt in windows:
+                    print(f"[데몬] 조회 구간 처리: {inqry_bgn_dt} ~ {inqry_end_dt}")
+                    reset_request_cache()
+                    ctx.set_window(inqry_bgn_dt, inqry_end_dt)
+                    run_pipeline(NOTICE_TYPES, ctx)
+
+                    # 조회 실패 시 해당 구간부터 다음 주기에 다시 처리
+                    if ctx.failed_types:
+                        print(f"[데몬] 조회 실패 ({', '.join(sorted(ctx.failed_types))}) - 다음 주기에 재시도")
+                        break
+
+                    state['last_window_end'] = inqry_end_dt
+                    save_daemon_state(state, state_file)
+                    if stopping.is_set():
+                        break
+
+            except Exception as e:
+                # 한 주기의 오류로 데몬을 멈추지 않음 - 처리하지 못한 구간은 다음 주기에 다시 처리
+                # (발송 대기 로그에 남은 메시지는 다음 실행의 recover_outbox 가 이어서 처리)
+                print(f"[데몬] 주기 처리 중 오류 발생 - 다음 주기에 재시도: {type(e).__name__}: {e}")
+
+            stopping.wait(CHECK_INTERVAL_SECONDS)
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("[데몬] 종료")
+        ctx.close()
+
+if __name__ == "__main__":
+    raise SystemExit(run_daemon())
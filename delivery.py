@@ -0,0 +1,331 @@
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from metrics import METRICS
+from outbox import STATE_FAILED, STATE_SENT, STATE_SUBMITTING
+
+# 솔라피 그룹 1회 요청당 최대 메시지 수
+SMS_GROUP_SIZE = 10000
+
+# 발송 요청 스레드별 마지막 솔라피 HTTP 응답 상태 코드 (응답을 받지 못했으면 None)
+_response_status = threading.local()
+
+# 요약 발송: LMS 본문 최대 바이트(EUC-KR 기준)와 머리말 예약 바이트
+LMS_MAX_BYTES = 2000
+DIGEST_HEADER_BYTES = 60
+
+def message_bytes(text):
+    """문자 본문 바이트 수 (EUC-KR 기준)"""
+    return len(text.encode("euc-kr", errors="replace"))
+
+def pack_lines(lines, max_bytes=LMS_MAX_BYTES - DIGEST_HEADER_BYTES):
+    """요약 줄을 max_bytes 이내 묶음으로 나누기 - 줄 인덱스 목록의 목록 반환"""
+    packs = []
+    current, size = [], 0
+    for idx, line in enumerate(lines):
+        line_size = message_bytes(line) + 1
+        if current and size + line_size > max_bytes:
+            packs.append(current)
+            current, size = [], 0
+        current.append(idx)
+        size += line_size
+    if current:
+        packs.append(current)
+    return packs
+
+def call_all(callbacks):
+    """콜백 모두 호출"""
+    for callback in callbacks:
+        if callback is not None:
+            callback()
+
+def recording_fetcher(auth_parameter, request, data=None):
+    """solapi default_fetcher 대체 - 동작은 같고 받은 응답의 HTTP 상태 코드를 기록
+
+    발송 오류가 응답을 받기 전에 났는지, 받은 응답이 4xx·5xx·2xx 중 무엇인지
+    구분하기 위해 사용한다(is_unconfirmed_error).
+    """
+    import httpx
+    from solapi.lib.authenticator import Authenticator
+
+    headers = {
+        "Authorization": Authenticator(auth_parameter["api_key"], auth_parameter["api_secret"]).get_auth_info(),
+        "Content-Type": "application/json",
+        "Connection": "keep-alive",
+    }
+    with httpx.Client(transport=httpx.HTTPTransport(retries=3)) as client:
+        response = client.request(method=request["method"], url=request["url"], headers=headers, json=data)
+    _response_status.code = response.status_code
+
+    if 400 <= response.status_code < 500:
+        error_response = response.json()
+        raise Exception(
+            error_response.get("errorCode", "UnknownError"),
+            error_response.get("errorMessage", "An Error occurred"),
+        )
+    if response.status_code >= 500:
+        raise Exception("UnknownError", response.text)
+    try:
+        return response.json()
+    except Exception as exc:
+        raise Exception(response.text) from exc
+
+def use_recording_fetcher():
+    """solapi 메시지 서비스가 recording_fetcher 로 요청하도록 설정"""
+    from solapi.services import message_service
+    message_service.default_fetcher = recording_fetcher
+
+def is_unconfirmed_error(error, status_code):
+    """요청이 전달된 뒤 발생하여 접수 여부를 알 수 없는 발송 오류인지 판별
+
+    status_code 는 받은 HTTP 응답 상태 코드(받지 못했으면 None)이다.
+    2xx 응답을 받은 뒤의 오류(응답 해석·검증 실패)와 5xx 응답, 요청 전달 후
+    응답 대기 중 시간 초과·연결 끊김만 해당한다. 4xx 응답(잘못된 API 키, 잔액
+    부족, 미등록 발신번호 등)과 요청 전 오류(설정 누락, 연결 실패 등)는 발송되지
+    않은 것이 확실하므로 접수 거부로 처리한다.
+    """
+    if status_code is not None:
+        return not 400 <= status_code < 500
+    import httpx
+    return isinstance(error, (
+        httpx.ReadTimeout, httpx.WriteTimeout, httpx.ReadError, httpx.WriteError,
+        httpx.CloseError, httpx.RemoteProtocolError,
+    ))
+
+class LazyMessageService:
+    """첫 발송 시점에 문자 발송 클라이언트를 생성하는 대리 객체 (발송할 메시지가 없으면 생성하지 않음)"""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.service = None
+        self.lock = threading.Lock()
+
+    def send(self, *args, **kwargs):
+        """클라이언트 생성 후 발송 요청 전달"""
+        with self.lock:
+            if self.service is None:
+                self.service = self.factory()
+        return self.service.send(*args, **kwargs)
+
+class DeliveryQueue:
+    """실행 단위 문자 발송 대기열
+
+    실행 중 발송할 메시지를 모아 두었다가 그룹 단위로 일괄 발송하고,
+    솔라피가 접수한 메시지에 대해서만 on_sent 콜백을 호출한다.
+    여러 공고 유형이 동시에 등록할 수 있도록 등록은 잠금으로 보호한다.
+    outbox 가 주어지면 발송 전 메시지와 그룹별 요청·접수 결과를 먼저 기록하며,
+    workers 가 2 이상이면 여러 그룹을 동시에 발송한다.
+    silent 이면 문자를 보내지 않고 공고 알림의 on_sent 만 호출한다(이력만 반영).
+    read_only 이면 문자 발송·이력 반영 없이 발송할 메시지 수만 집계한다.
+    digest 이면 요약 줄(line)이 있는 공고 알림을 수신번호별로 모아
+    LMS 바이트 제한 안에서 최소 개수의 요약 메시지로 묶어 발송한다.
+    """
+
+    def __init__(self, message_service, sender_phone, group_size=SMS_GROUP_SIZE, outbox=None,
+                 workers=1, silent=False, digest=False, read_only=False):
+        self.message_service = message_service
+        self.sender_phone = sender_phone
+        self.group_size = group_size
+        self.outbox = outbox
+        self.workers = workers
+        self.silent = silent
+        self.digest = digest
+        self.read_only = read_only
+        self.pending = []
+        self.keys = set()
+        self.lock = threading.Lock()
+
+    def add(self, recipient_phone, message_text, key=None, on_sent=None, category=None, line=None):
+        """메시지 등록 - 같은 key 가 이미 대기 중이면 False (line 은 요약 발송용 한 줄)"""
+        with self.lock:
+            if key is not None:
+                if key in self.keys:
+                    return False
+                self.keys.add(key)
+            self.pending.append({
+                "to": recipient_phone,
+                "text": message_text,
+                "keys": [key] if key is not None else [],
+                "categories": [category] if key is not None else [],
+                "on_sent": on_sent,
+                "line": line,
+                "id": None,
+            })
+        return True
+
+    def restore(self, entry, on_sent=None):
+        """발송 대기 로그에서 복구한 메시지 등록 (이미 묶인 메시지는 다시 묶지 않음)"""
+        keys = [tuple(key) for key in entry.get("keys") or []]
+        with self.lock:
+            self.keys.update(keys)
+            self.pending.append({
+                "to": entry["to"],
+                "text": entry["text"],
+                "keys": keys,
+                "categories": list(entry.get("categories") or []),
+                "on_sent": on_sent,
+                "line": None,
+                "id": entry["id"],
+            })
+
+    def _pack(self, pending):
+        """수신번호별 공고 알림을 요약 메시지로 묶기 (알림이 하나뿐이면 원래 메시지 유지)"""
+        packed = []
+        by_phone = {}
+        for entry in pending:
+            if entry["line"] is None:
+                packed.append(entry)
+            else:
+                by_phone.setdefault(entry["to"], []).append(entry)
+
+        for phone, entries in by_phone.items():
+            if len(entries) == 1:
+                packed.append(entries[0])
+                continue
+            packs = pack_lines([entry["line"] for entry in entries])
+            for part_no, indexes in enumerate(packs, start=1):
+                members = [entries[idx] for idx in indexes]
+                header = f"[공고 알림] 새 공고 {len(entries)}건"
+                if len(packs) > 1:
+                    header += f" ({part_no}/{len(packs)})"
+                packed.append({
+                    "to": phone,
+                    "text": "\n".join([header] + [member["line"] for member in members]),
+                    "keys": [key for member in members for key in member["keys"]],
+                    "categories": [category for member in members for category in member["categories"]],
+                    "on_sent": partial(call_all, [member["on_sent"] for member in members]),
+                    "line": None,
+                    "id": None,
+                })
+        if len(packed) < len(pending):
+            print(f"[요약 발송] 메시지 {len(pending)}건을 {len(packed)}건으로 묶음")
+        return packed
+
+    def _mark(self, state, group, indexes):
+        """발송 대기 로그에 메시지 상태 기록"""
+        if self.outbox is not None:
+            self.outbox.mark(state, [group[idx]["id"] for idx in sorted(indexes)])
+
+    def _send_group(self, group):
+        """한 그룹 발송 - 접수 실패한 메시지의 인덱스 집합 반환
+
+        요청 전달 후 접수 여부를 알 수 없는 오류(is_unconfirmed_error)이면 None 을
+        반환한다. 이 경우 중복 발송을 막기 위해 발송된 것으로 보고 이력에 반영한다
+        (최대 1회 발송). 그 밖의 오류는 그룹 전체를 접수 거부로 기록하여 재시도한다.
+        """
+        # 문자 발송 SDK 는 실제 발송 시에만 로딩
+        from solapi.error.MessageNotReceiveError import MessageNotReceivedError
+        from solapi.model import RequestMessage, SendRequestConfig
+
+        messages = [
+            RequestMessage(
+                from_=self.sender_phone,
+                to=entry["to"],
+                text=entry["text"],
+                custom_fields={"idx": str(idx)},
+            )
+            for idx, entry in enumerate(group)
+        ]
+        self._mark(STATE_SUBMITTING, group, range(len(group)))
+        _response_status.code = None
+        try:
+            with METRICS.timer("bidnotice_sms_request_duration_seconds"):
+                res = self.message_service.send(
+                    messages, SendRequestConfig(allow_duplicates=True)
+                )
+        except MessageNotReceivedError as e:
+            print(f"문자 일괄 발송 실패 ({len(group)}건): {str(e)}")
+            METRICS.inc("bidnotice_sms_messages_total", len(group), result="failed")
+            self._mark(STATE_FAILED, group, range(len(group)))
+            return set(range(len(group)))
+        except Exception as e:
+            if is_unconfirmed_error(e, _response_status.code):
+                print(f"문자 일괄 발송 오류 - 접수 여부 확인 불가, 재발송하지 않음 ({len(group)}건): {str(e)}")
+                METRICS.inc("bidnotice_sms_messages_total", len(group), result="unconfirmed")
+                return None
+            print(f"문자 일괄 발송 실패 - 발송되지 않음 ({len(group)}건): {str(e)}")
+            METRICS.inc("bidnotice_sms_messages_total", len(group), result="failed")
+            self._mark(STATE_FAILED, group, range(len(group)))
+            return set(range(len(group)))
+
+        failed = set()
+        for failed_message in res.failed_message_list or []:
+            fields = failed_message.custom_fields or {}
+            if "idx" in fields:
+                failed.add(int(fields["idx"]))
+            else:
+                # 인덱스를 알 수 없으면 같은 수신번호의 메시지를 모두 실패로 간주
+                failed.update(idx for idx, entry in enumerate(group) if entry["to"] == failed_message.to)
+
+        self._mark(STATE_SENT, group, set(range(len(group))) - failed)
+        self._mark(STATE_FAILED, group, failed)
+
+        METRICS.inc("bidnotice_sms_messages_total", len(group) - len(failed), result="accepted")
+        METRICS.inc("bidnotice_sms_messages_total", len(failed), result="failed")
+        print(
+            f"문자 일괄 발송 완료 (Group ID: {res.group_info.group_id}, "
+            f"접수 {len(group) - len(failed)}건 / 실패 {len(failed)}건)"
+        )
+        return failed
+
+    def _record_silently(self, pending):
+        """발송 없이 공고 알림을 발송된 것으로 이력에만 반영"""
+        recorded = Counter()
+        for entry in pending:
+            if not entry["keys"]:
+                continue
+            if entry["on_sent"] is not None:
+                entry["on_sent"]()
+            recorded.update(entry["categories"])
+        print(f"[이력만 반영] 문자 발송 없이 {sum(recorded.values())}건 기록")
+        return recorded
+
+    def _preview(self, pending):
+        """발송·이력 반영 없이 발송할 공고 알림 수만 집계"""
+        counted = Counter()
+        for entry in pending:
+            counted.update(entry["categories"])
+        print(f"[읽기 전용] 문자 {len(pending)}건 발송 생략 (공고 알림 {sum(counted.values())}건, 이력 미반영)")
+        return counted
+
+    def flush(self):
+        """대기 중인 메시지 일괄 발송 - 분류(category)별 접수된 공고 알림 수 반환"""
+        accepted = Counter()
+        with self.lock:
+            pending, self.pending = self.pending, []
+            self.keys.clear()
+
+        if self.read_only:
+            return self._preview(pending)
+        if self.silent:
+            return self._record_silently(pending)
+        if self.digest:
+            pending = self._pack(pending)
+
+        # 발송 전 메시지를 먼저 기록 (중단 시 다음 실행에서 이어서 발송)
+        if self.outbox is not None:
+            self.outbox.plan(pending)
+
+        groups = [pending[start:start + self.group_size] for start in range(0, len(pending), self.group_size)]
+        if self.workers > 1 and len(groups) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(groups))) as executor:
+                results = list(executor.map(self._send_group, groups))
+        else:
+            results = [self._send_group(group) for group in groups]
+
+        for group, failed in zip(groups, results):
+            for idx, entry in enumerate(group):
+                if failed is None:
+                    if entry["on_sent"] is not None:
+                        entry["on_sent"]()
+                    continue
+                outcome = "failed" if idx in failed else "sent"
+                for category in entry["categories"]:
+                    METRICS.inc("bidnotice_items_total", notice_type=category, outcome=outcome)
+                if idx in failed:
+                    continue
+                if entry["on_sent"] is not None:
+                    entry["on_sent"]()
+                accepted.update(entry["categories"])
+        return accepted
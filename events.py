@@ -0,0 +1,181 @@
+import atexit
+import json
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import quote, quote_plus
+
+# 이벤트 수준 (설정 수준 미만의 이벤트는 기록하지 않음)
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+DISABLED = ERROR + 1
+
+# 배치 기록 설정
+EVENT_BATCH_SIZE = 500
+EVENT_FLUSH_INTERVAL = 1.0
+
+# 비밀 값 가리기: 이름이 이 키인 필드·URL 파라미터의 값
+SECRET_KEYS = ("ServiceKey", "serviceKey", "api_key", "api_secret", "coolsms_api_key", "coolsms_api_secret")
+SECRET_PARAM_PATTERN = re.compile(r"((?:%s)=)[^&\s]+" % "|".join(SECRET_KEYS))
+REDACTED = "***"
+
+class EventLog:
+    """JSON lines 구조화 이벤트 로그 (백그라운드 스레드 배치 기록)
+
+    호출 스레드는 수준·샘플링 확인 후 (시각, 수준, 이벤트, 필드)를 큐에 넣기만 하고,
+    필드 값이 호출 가능 객체이면 기록 스레드에서 호출하여 값을 얻는다(지연 수집).
+    직렬화·비밀 값 가리기·파일 기록은 모두 기록 스레드에서 배치 단위로 수행한다.
+    configure 전이거나 경로가 없으면 아무것도 기록하지 않는다.
+    """
+
+    def __init__(self, batch_size=EVENT_BATCH_SIZE, flush_interval=EVENT_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.level = DISABLED
+        self.sample_rate = 1.0
+        self.secrets = ()
+        self.queue = queue.SimpleQueue()
+        self.file = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def configure(self, path=None, level="info", sample_rate=1.0, secrets=()):
+        """기록 위치('-' 이면 표준 출력)·수준·샘플링 비율·가릴 비밀 값 설정"""
+        with self.lock:
+            self._stop()
+            self.sample_rate = sample_rate
+            # URL 인코딩된 형태도 함께 가림
+            values = {v for s in secrets if s for v in (s, quote(s, safe=""), quote_plus(s))}
+            self.secrets = tuple(sorted(values, key=len, reverse=True))
+            if not path:
+                self.level = DISABLED
+                return
+            self.level = LEVELS.get(str(level).lower(), INFO)
+            self.file = sys.stdout if path == "-" else open(path, 'a', encoding="utf-8")
+            self.thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+            self.thread.start()
+
+    def enabled(self, level):
+        """수준 기록 여부 - 반복문에서 필드 준비 전에 확인"""
+        return level >= self.level
+
+    def emit(self, level, event, **fields):
+        """이벤트 등록 (수준 미만이거나 샘플링에서 빠지면 무시)"""
+        if level < self.level:
+            return
+        # 샘플링은 경고 미만 이벤트에만 적용
+        if level < WARNING and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        self.queue.put((time.time(), level, event, fields))
+
+    def debug(self, event, **fields):
+        """디버그 수준 이벤트 등록"""
+        self.emit(DEBUG, event, **fields)
+
+    def info(self, event, **fields):
+        """정보 수준 이벤트 등록"""
+        self.emit(INFO, event, **fields)
+
+    def warning(self, event, **fields):
+        """경고 수준 이벤트 등록"""
+        self.emit(WARNING, event, **fields)
+
+    def error(self, event, **fields):
+        """오류 수준 이벤트 등록"""
+        self.emit(ERROR, event, **fields)
+
+    def flush(self, timeout=10):
+        """등록된 이벤트가 모두 기록될 때까지 대기"""
+        if self.thread is None:
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """남은 이벤트 기록 후 기록 스레드 종료"""
+        with self.lock:
+            self._stop()
+
+    def _stop(self):
+        """기록 스레드 종료 및 파일 닫기 (lock 보유 상태에서 호출)"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.file is not None and self.file is not sys.stdout:
+            self.file.close()
+        self.file = None
+        self.level = DISABLED
+
+    def _run(self):
+        """기록 스레드 - 큐에서 최대 batch_size 개씩 모아 한 번에 기록"""
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            waiters = []
+            stop = False
+            for entry in batch:
+                if entry is None:
+                    stop = True
+                elif isinstance(entry, threading.Event):
+                    waiters.append(entry)
+                else:
+                    lines.append(self._serialize(*entry))
+            if lines:
+                self.file.write("".join(lines))
+                self.file.flush()
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _serialize(self, timestamp, level, event, fields):
+        """이벤트 한 줄 - 지연 필드 계산 및 비밀 값 가리기"""
+        record = {
+            "ts": datetime.fromtimestamp(timestamp).isoformat(timespec="milliseconds"),
+            "level": LEVEL_NAMES.get(level, str(level)),
+            "event": event,
+        }
+        for key, value in fields.items():
+            if callable(value):
+                try:
+                    value = value()
+                except Exception as e:
+                    value = f"<필드 수집 오류: {e}>"
+            record[key] = REDACTED if key in SECRET_KEYS else self.redact(value)
+        return json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+    def redact(self, value):
+        """문자열·dict·목록 안의 비밀 값 가리기 (콘솔 출력에도 사용)"""
+        if isinstance(value, str):
+            value = SECRET_PARAM_PATTERN.sub(r"\1" + REDACTED, value)
+            for secret in self.secrets:
+                value = value.replace(secret, REDACTED)
+            return value
+        if isinstance(value, dict):
+            return {k: REDACTED if k in SECRET_KEYS else self.redact(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.redact(v) for v in value]
+        return value
+
+# 프로세스 전역 이벤트 로그 (종료 시 남은 이벤트 기록)
+EVENTS = EventLog()
+atexit.register(EVENTS.close)
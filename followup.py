@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from common import TIME_FORMAT, load_json, save_json
+
+# 이미 알림을 보낸 공고의 후속(낙찰 결과) 추적 상태 파일
+FOLLOWUP_FILE = "followups.json"
+FOLLOWUP_CHUNK_DAYS = 7
+
+def load_followups(path=FOLLOWUP_FILE):
+    """공고 유형별 후속 추적 상태 로딩"""
+    return load_json(path)
+
+def save_followups(followups, path=FOLLOWUP_FILE):
+    """후속 추적 상태 저장 (임시 파일 작성 후 교체)"""
+    save_json(followups, path)
+
+def collect_open_notices(history, subscribers, source_key, resolved_key):
+    """source_key 이력 중 resolved_key 이력이 없는 공고 - {공고번호: [사용자 이름]}
+
+    처리 대상(샤드·이름 제한) 구독자의 이력만 모은다.
+    """
+    resolved = set(history.notices(resolved_key))
+    open_notices = {}
+    for name, notice_no in history.notices(source_key):
+        if (name, notice_no) in resolved or subscribers.phone_of(name) is None:
+            continue
+        open_notices.setdefault(notice_no, []).append(name)
+    return open_notices
+
+def update_tracked(state, open_notices, now, lookback_days, max_days):
+    """추적 대상 갱신 - 새 미해결 공고 추가, 해결된 공고와 max_days 경과 공고 제외
+
+    처음 실행하면 lookback_days 이전부터 조회하며, 이후에는 마지막 확인
+    시점(checked_until)부터 조회한다. 반환값은 이번에 조회할 구간 시작 시각.
+    """
+    earliest = now - timedelta(days=max_days)
+    checked_until = state.get('checked_until')
+    scan_from = datetime.strptime(checked_until, TIME_FORMAT) if checked_until else now - timedelta(days=lookback_days)
+    scan_from = max(scan_from, earliest)
+    since = scan_from.strftime(TIME_FORMAT)
+
+    tracked = state.setdefault('tracked', {})
+    expired = set(state.get('expired', []))
+    for notice_no in list(tracked):
+        if notice_no not in open_notices:
+            # 다른 경로(검색 조건)로 낙찰 알림을 이미 받은 공고
+            del tracked[notice_no]
+        elif datetime.strptime(tracked[notice_no]['since'], TIME_FORMAT) < earliest:
+            # 유찰 등으로 결과가 나오지 않는 공고는 더 이상 추적하지 않음
+            del tracked[notice_no]
+            expired.add(notice_no)
+
+    for notice_no, names in open_notices.items():
+        if notice_no in expired:
+            continue
+        entry = tracked.setdefault(notice_no, {'since': since})
+        entry['users'] = sorted(names)
+
+    state['expired'] = sorted(expired & set(open_notices))
+    return scan_from
+
+def followup_windows(bgn, end, chunk_days=FOLLOWUP_CHUNK_DAYS):
+    """후속 조회 구간을 chunk_days 크기로 분할 - (시작, 종료) 문자열 목록"""
+    windows = []
+    while bgn < end:
+        chunk_end = min(bgn + timedelta(days=chunk_days), end)
+        windows.append((bgn.strftime(TIME_FORMAT), chunk_end.strftime(TIME_FORMAT)))
+        bgn = chunk_end
+    return windows
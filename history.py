@@ -0,0 +1,209 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from common import SENT_FILE, load_sent_data, save_sent_data
+
+try:
+    import fcntl
+except ImportError:
+    # fcntl 이 없는 환경(Windows)은 프로세스 내 잠금만 사용
+    fcntl = None
+
+# 발송 이력 저장소 설정
+HISTORY_BACKEND_JSON = "json"
+HISTORY_BACKEND_SQLITE = "sqlite"
+HISTORY_DB_FILE = "sent_notifications.db"
+NOTICE_KEYS = ("bid_notices", "pre_notices", "award_notices")
+SQLITE_BUSY_TIMEOUT = 60
+
+# 같은 프로세스의 여러 공고 유형이 JSON 이력을 동시에 저장할 때의 잠금
+_json_lock = threading.Lock()
+
+@contextmanager
+def locked_file(path):
+    """여러 프로세스(샤드) 간 파일 잠금 - <path>.lock 에 배타 잠금"""
+    with _json_lock, open(f"{path}.lock", 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+class JsonSentHistory:
+    """sent_notifications.json 기반 발송 이력 (기존 형식 유지)
+
+    commit 은 파일 잠금 안에서 최신 파일에 병합하므로 여러 샤드 프로세스가
+    같은 파일을 공유해도 서로의 이력을 덮어쓰지 않는다.
+    """
+
+    def __init__(self, path=SENT_FILE):
+        self.path = path
+        self.index = {}
+        self.pending = []
+        for name, user_data in load_sent_data(path).items():
+            for notice_key in NOTICE_KEYS:
+                self.index[(name, notice_key)] = set(user_data.get(notice_key, []))
+
+    def contains(self, name, notice_key, notice_no):
+        """발송 여부 확인"""
+        return notice_no in self.index.get((name, notice_key), ())
+
+    def notices(self, notice_key):
+        """공고 유형의 발송 이력 (사용자 이름, 공고번호) 목록"""
+        return [
+            (name, notice_no)
+            for (name, key), notice_nos in self.index.items() if key == notice_key
+            for notice_no in notice_nos
+        ]
+
+    def add(self, name, notice_key, notice_no):
+        """발송 이력 추가 (commit 시 저장)"""
+        self.index.setdefault((name, notice_key), set()).add(notice_no)
+        self.pending.append((name, notice_key, notice_no))
+
+    def commit(self):
+        """추가된 이력만 최신 파일에 병합하여 원자적으로 저장"""
+        if not self.pending:
+            return
+        with locked_file(self.path):
+            latest = load_sent_data(self.path)
+            for name, notice_key, notice_no in self.pending:
+                user_data = latest.setdefault(name, {key: [] for key in NOTICE_KEYS})
+                notices = user_data.setdefault(notice_key, [])
+                if notice_no not in notices:
+                    notices.append(notice_no)
+            save_sent_data(latest, self.path)
+        self.pending = []
+
+    def close(self):
+        """저장소 닫기"""
+
+class SqliteSentHistory:
+    """SQLite 기반 발송 이력
+
+    (사용자, 공고 유형, 공고번호) 기본 키 인덱스로 중복을 확인하고,
+    commit 시 새 이력만 하나의 트랜잭션으로 추가한다.
+    ttl_days 가 지정되면 오래된 이력을 commit 시 정리한다.
+    여러 샤드 프로세스가 같은 DB 를 쓰면 잠금 해제를 busy_timeout 동안 기다린다.
+    """
+
+    def __init__(self, path=HISTORY_DB_FILE, ttl_days=0, read_only=False):
+        self.ttl_days = ttl_days
+        self.pending = {}
+        self.lock = threading.Lock()
+        if read_only and os.path.exists(path):
+            # 읽기 전용 (dry-run): 스키마 생성·정리 없이 기존 DB 조회만
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=SQLITE_BUSY_TIMEOUT,
+                                        check_same_thread=False)
+            return
+        # 읽기 전용인데 DB 가 없으면 빈 메모리 DB 사용
+        self.conn = sqlite3.connect(":memory:" if read_only else path, timeout=SQLITE_BUSY_TIMEOUT,
+                                    check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sent_notifications (
+                user TEXT NOT NULL,
+                notice_type TEXT NOT NULL,
+                notice_no TEXT NOT NULL,
+                sent_at TEXT NOT NULL,
+                PRIMARY KEY (user, notice_type, notice_no)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_sent_at ON sent_notifications (sent_at);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            """
+        )
+
+    def contains(self, name, notice_key, notice_no):
+        """발송 여부 확인"""
+        if (name, notice_key, notice_no) in self.pending:
+            return True
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM sent_notifications WHERE user = ? AND notice_type = ? AND notice_no = ?",
+                (name, notice_key, notice_no),
+            ).fetchone()
+        return row is not None
+
+    def notices(self, notice_key):
+        """공고 유형의 발송 이력 (사용자 이름, 공고번호) 목록"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT user, notice_no FROM sent_notifications WHERE notice_type = ?", (notice_key,)
+            ).fetchall()
+        pending = [(name, notice_no) for name, key, notice_no in self.pending if key == notice_key]
+        return rows + pending
+
+    def add(self, name, notice_key, notice_no):
+        """발송 이력 추가 (commit 시 저장)"""
+        self.pending[(name, notice_key, notice_no)] = datetime.now().isoformat(timespec="seconds")
+
+    def commit(self):
+        """추가된 이력 저장 및 만료 이력 정리"""
+        rows = [key + (sent_at,) for key, sent_at in self.pending.items()]
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO sent_notifications (user, notice_type, notice_no, sent_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            if self.ttl_days > 0:
+                self.prune(self.ttl_days)
+        self.pending = {}
+
+    def prune(self, max_age_days):
+        """max_age_days 보다 오래된 이력 삭제 - 삭제 건수 반환"""
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat(timespec="seconds")
+        cursor = self.conn.execute("DELETE FROM sent_notifications WHERE sent_at < ?", (cutoff,))
+        if cursor.rowcount:
+            print(f"[발송 이력] {max_age_days}일 경과 이력 {cursor.rowcount}건 정리")
+        return cursor.rowcount
+
+    def migrate_from_json(self, path=SENT_FILE):
+        """기존 JSON 발송 이력 1회 이전 - 이전 건수 반환"""
+        with self.lock, self.conn:
+            done = self.conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+            if done or not os.path.exists(path):
+                return 0
+
+            migrated_at = datetime.now().isoformat(timespec="seconds")
+            rows = [
+                (name, notice_key, str(notice_no), migrated_at)
+                for name, user_data in load_sent_data(path).items()
+                for notice_key in NOTICE_KEYS
+                for notice_no in user_data.get(notice_key, [])
+                if notice_no
+            ]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO sent_notifications (user, notice_type, notice_no, sent_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)", (migrated_at,)
+            )
+        print(f"[발송 이력] {path} 에서 {len(rows)}건 이전 완료")
+        return len(rows)
+
+    def close(self):
+        """저장소 닫기"""
+        self.conn.close()
+
+def open_sent_history(read_only=False):
+    """HISTORY_BACKEND 설정에 따른 발송 이력 저장소 생성 (read_only 이면 DB 이전·기록 없음)"""
+    backend = os.getenv('HISTORY_BACKEND', HISTORY_BACKEND_JSON)
+    if backend == HISTORY_BACKEND_SQLITE:
+        history = SqliteSentHistory(
+            os.getenv('HISTORY_DB', HISTORY_DB_FILE),
+            ttl_days=int(os.getenv('HISTORY_TTL_DAYS', '0')),
+            read_only=read_only,
+        )
+        if not read_only:
+            history.migrate_from_json()
+        return history
+    return JsonSentHistory()
@@ -1,19 +1,156 @@
-from bid_notice import main as bid_main
-from pre_notice import main as pre_main
-from award_notice import main as award_main
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from common import FETCH_MODE_WINDOW, TIME_FORMAT, WINDOW_MODE_BATCH, current_time, load_environment
+from pipeline import load_run_context, plan_pipeline, prefetch_shard_windows, run_pipeline
+from bid_notice import BID_NOTICE
+from pre_notice import PRE_NOTICE
+from award_notice import AWARD_NOTICE
+
+# 실행할 공고 유형 (새 공고 유형은 NoticeType 설정 추가 후 등록)
+NOTICE_TYPES = [BID_NOTICE, PRE_NOTICE, AWARD_NOTICE]
+
+def parse_time(value):
+    """YYYYMMDDHHMM 형식 시각 인자 검증"""
+    try:
+        datetime.strptime(value, TIME_FORMAT)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"YYYYMMDDHHMM 형식이 아닙니다: {value}")
+    return value
+
+def parse_types(value):
+    """쉼표로 구분한 공고 유형 인자 검증"""
+    known = [nt.type for nt in NOTICE_TYPES]
+    types = [t.strip() for t in value.split(",") if t.strip()]
+    unknown = [t for t in types if t not in known]
+    if unknown or not types:
+        raise argparse.ArgumentTypeError(f"알 수 없는 공고 유형: {value} (사용 가능: {','.join(known)})")
+    return types
+
+def parse_args(argv=None):
+    """명령행 인자 해석"""
+    parser = argparse.ArgumentParser(description="공고 알림 서비스")
+    parser.add_argument(
+        "--types", type=parse_types, metavar="TYPE[,TYPE]",
+        help="처리할 공고 유형 (bid, pre, award - 기본값 전체)",
+    )
+    parser.add_argument(
+        "--from", dest="since", type=parse_time, metavar="YYYYMMDDHHMM",
+        help="조회 구간 시작 (--to 와 함께 지정, 워터마크 대신 이 구간만 조회)",
+    )
+    parser.add_argument(
+        "--to", dest="until", type=parse_time, metavar="YYYYMMDDHHMM",
+        help="조회 구간 종료",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="API 요청·문자 발송 없이 유형별 조회 계획만 출력",
+    )
+    parser.add_argument(
+        "--profile", metavar="DIR",
+        help="단계별 cProfile·tracemalloc 결과를 저장할 디렉터리 (지정 시 프로파일링)",
+    )
+    parser.add_argument(
+        "--shard", metavar="I/N",
+        help="사용자를 N개로 나눈 샤드 중 I번(0부터)만 처리",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, metavar="N",
+        help="사용자를 N개 샤드로 나누어 하위 프로세스로 동시 실행",
+    )
+    args = parser.parse_args(argv)
+    if (args.since is None) != (args.until is None):
+        parser.error("--from 과 --to 는 함께 지정해야 합니다.")
+    if args.since and args.since >= args.until:
+        parser.error("--from 은 --to 보다 이전이어야 합니다.")
+    return args
+
+def select_notice_types(types=None):
+    """지정한 공고 유형 설정 목록 (등록 순서 유지) - 없으면 전체"""
+    if not types:
+        return NOTICE_TYPES
+    return [nt for nt in NOTICE_TYPES if nt.type in types]
+
+def run_workers(args):
+    """샤드별 하위 프로세스 실행 - 종료 코드 반환
+
+    구간 전체 조회 모드에서는 샤드마다 같은 구간을 나누어 받은 속도 한도로
+    다시 조회하지 않도록, 부모 프로세스가 먼저 구간을 한 번 조회하여 원본 응답
+    캐시에 저장하고 같은 기준 시각(RUN_TIME)으로 샤드를 실행한다.
+    """
+    from sharding import run_shards
+
+    def args_for(index):
+        child_args = []
+        if args.types:
+            child_args += ["--types", ",".join(args.types)]
+        if args.since:
+            child_args += ["--from", args.since, "--to", args.until]
+        if args.dry_run:
+            child_args.append("--dry-run")
+        if args.profile:
+            child_args += ["--profile", os.path.join(args.profile, f"shard{index}")]
+        return child_args
+
+    env_vars = load_environment()
+    shared_cache_dir = None
+    try:
+        if env_vars['fetch_mode'] == FETCH_MODE_WINDOW and not args.dry_run and os.getenv('RESPONSE_CACHE_REPLAY') != '1':
+            now = current_time(env_vars).replace(second=0, microsecond=0)
+            os.environ['RUN_TIME'] = now.strftime(TIME_FORMAT)
+            if os.getenv('RESPONSE_CACHE') != '1':
+                # 응답 캐시를 쓰지 않는 설정이면 이번 실행 동안만 임시 캐시 사용
+                shared_cache_dir = tempfile.mkdtemp(prefix="bidnotice-responses-")
+                os.environ['RESPONSE_CACHE'] = '1'
+                os.environ['RESPONSE_CACHE_DIR'] = shared_cache_dir
+            window = (args.since, args.until) if args.since else None
+            prefetch_shard_windows(select_notice_types(args.types), env_vars, now, args.workers, window)
+
+        failed = run_shards(args.workers, os.path.abspath(__file__), args_for)
+    finally:
+        if shared_cache_dir:
+            shutil.rmtree(shared_cache_dir, ignore_errors=True)
+    return 1 if failed else 0
+
+def main(argv=None):
+    """공고 알림 서비스 실행 - 종료 코드 반환"""
+    args = parse_args(argv)
+    if args.workers > 1:
+        return run_workers(args)
 
-def main():
-    """공고 알림 서비스 실행"""
     try:
-        # 입찰공고 처리
-        bid_main()
-        # 사전공고 처리
-        pre_main()
-        # 낙찰공고 처리
-        award_main()
+        if args.shard:
+            from sharding import parse_shard
+            parse_shard(args.shard)
+            os.environ['SHARD'] = args.shard
+
+        if args.profile:
+            from profiling import enable_profiling
+            enable_profiling(args.profile)
+
+        notice_types = select_notice_types(args.types)
+        window = (args.since, args.until) if args.since else None
+
+        # 설정·사용자·발송 이력은 한 번만 로딩하고, 발송과 이력 저장도 한 번만 수행
+        ctx = load_run_context(window=window, dry_run=args.dry_run)
+        try:
+            if window:
+                # 지정 구간은 워터마크를 사용·갱신하지 않음
+                ctx.env_vars['window_mode'] = WINDOW_MODE_BATCH
+            if args.dry_run:
+                plan_pipeline(notice_types, ctx)
+            else:
+                run_pipeline(notice_types, ctx)
+        finally:
+            ctx.close()
 
     except Exception as e:
         print(f"서비스 실행 중 오류 발생: {str(e)}")
+        return 1
+    return 0
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,123 @@
+from collections import deque
+
+def normalize_text(text):
+    """매칭용 문자열 정규화"""
+    if text is None:
+        return ""
+    return " ".join(str(text).split()).casefold()
+
+def as_list(value):
+    """검색어 목록 - 문자열은 한 개짜리 목록, 목록은 빈 값 제외 (OR 조건)"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [v for v in value if v]
+    return [value] if value else []
+
+class AhoCorasick:
+    """다중 키워드 부분 문자열 매칭 오토마톤"""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._build()
+
+    def _add(self, pattern):
+        """트라이에 패턴 추가"""
+        state = 0
+        for ch in pattern:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        if pattern not in self.output[state]:
+            self.output[state].append(pattern)
+
+    def _build(self):
+        """실패 링크 구성"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail and ch not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[next_state] = self.goto[fail].get(ch, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text):
+        """텍스트에 포함된 패턴 집합 반환"""
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            if self.output[state]:
+                found.update(self.output[state])
+        return found
+
+class NoticeIndex:
+    """조회 구간 전체 공고에 대한 검색 조건 매칭 인덱스
+
+    field_map 은 검색 조건 키를 공고 항목 필드로 연결한다.
+    exact_keys 에 포함된 조건 키는 완전 일치, 나머지는 부분 문자열로 매칭한다.
+    조건 값이 목록이면 그중 하나라도 일치하는 공고를 찾는다(OR).
+    """
+
+    def __init__(self, items, field_map, conditions, exact_keys=("notice_number",)):
+        self.field_map = field_map
+        self.exact_keys = set(exact_keys)
+        self.items = []
+        self.postings = {key: {} for key in field_map}
+
+        # 조건 키별 패턴 수집 및 오토마톤 구성
+        automata = {}
+        for key in field_map:
+            if key in self.exact_keys:
+                continue
+            patterns = {normalize_text(v) for c in conditions for v in as_list(c.get(key))}
+            if patterns:
+                automata[key] = AhoCorasick(patterns)
+
+        # 공고 항목을 한 번씩만 스캔하여 역색인 구성
+        for item in items:
+            idx = len(self.items)
+            self.items.append(item)
+            for key, field in field_map.items():
+                value = normalize_text(item.get(field))
+                if not value:
+                    continue
+                if key in self.exact_keys:
+                    self.postings[key].setdefault(value, []).append(idx)
+                elif key in automata:
+                    for pattern in automata[key].find(value):
+                        self.postings[key].setdefault(pattern, []).append(idx)
+
+    def match(self, condition):
+        """검색 조건에 해당하는 공고 목록 반환"""
+        matched = None
+        for key in self.field_map:
+            values = as_list(condition.get(key))
+            if not values:
+                continue
+            hits = set()
+            for value in values:
+                hits.update(self.postings[key].get(normalize_text(value), ()))
+            matched = hits if matched is None else matched & hits
+            if not matched:
+                return []
+
+        if matched is None:
+            return []
+        return [self.items[idx] for idx in sorted(matched)]
@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+# 지연 시간 히스토그램 구간(초)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# 지표 설명 (Prometheus HELP)
+METRIC_HELP = {
+    "bidnotice_stage_duration_seconds": "파이프라인 단계별 소요 시간",
+    "bidnotice_api_request_duration_seconds": "공공데이터 API 요청 지연 시간",
+    "bidnotice_api_errors_total": "공공데이터 API 오류 수",
+    "bidnotice_sms_request_duration_seconds": "문자 발송 API 요청 지연 시간",
+    "bidnotice_sms_messages_total": "문자 발송 결과별 메시지 수",
+    "bidnotice_items_total": "공고 유형·처리 결과별 공고 수",
+    "bidnotice_last_run_timestamp_seconds": "마지막 실행 완료 시각",
+    "bidnotice_last_run_duration_seconds": "마지막 실행 소요 시간",
+}
+
+def format_labels(labels):
+    """Prometheus 레이블 문자열"""
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+class Metrics:
+    """카운터·게이지·히스토그램 지표 저장소 (Prometheus 텍스트 형식 출력)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.stage_hooks = []
+
+    def add_stage_hook(self, hook):
+        """단계 실행 구간을 감쌀 컨텍스트 관리자 팩토리 등록 (예: 프로파일러)"""
+        self.stage_hooks.append(hook)
+
+    def inc(self, name, value=1, **labels):
+        """카운터 증가"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """게이지 설정"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        """히스토그램 관측값 추가"""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """구간 소요 시간을 히스토그램에 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def stage(self, stage, **labels):
+        """파이프라인 단계 소요 시간 기록"""
+        with ExitStack() as stack:
+            for hook in self.stage_hooks:
+                stack.enter_context(hook(stage, **labels))
+            stack.enter_context(self.timer("bidnotice_stage_duration_seconds", stage=stage, **labels))
+            yield
+
+    def render(self):
+        """Prometheus 텍스트 형식 출력"""
+        lines = []
+        with self.lock:
+            sections = [
+                ("counter", self.counters),
+                ("gauge", self.gauges),
+            ]
+            for metric_type, values in sections:
+                for name in sorted({name for name, _ in values}):
+                    lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    for (metric_name, labels), value in sorted(values.items()):
+                        if metric_name == name:
+                            lines.append(f"{name}{format_labels(labels)} {value}")
+
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric_name, labels), histogram in sorted(self.histograms.items()):
+                    if metric_name != name:
+                        continue
+                    for bound, count in zip(self.buckets, histogram["buckets"]):
+                        lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {count}")
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {histogram['sum']}")
+                    lines.append(f"{name}_count{format_labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """node_exporter textfile 수집용 파일 저장 (임시 파일 작성 후 교체)"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port, host="0.0.0.0"):
+        """/metrics HTTP 엔드포인트를 백그라운드 스레드로 제공"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"[지표] http://{host}:{port}/metrics 제공 시작")
+        return server
+
+# 프로세스 전역 지표 저장소
+METRICS = Metrics()
@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+import uuid
+from sharding import shard_path
+
+# 발송 예정 메시지 선기록 로그 설정
+OUTBOX_FILE = "outbox.jsonl"
+OUTBOX_MAX_ATTEMPTS = 3
+
+# 메시지 상태: 발송 전 → 요청 중 → 접수 완료 / 접수 거부
+STATE_PLANNED = "planned"
+STATE_SUBMITTING = "submitting"
+STATE_SENT = "sent"
+STATE_FAILED = "failed"
+
+class Outbox:
+    """발송 예정 메시지 선기록 로그 (JSON lines, 기록마다 fsync)
+
+    메시지는 발송 전에 planned 로 기록되고, 그룹 요청 직전 submitting,
+    솔라피 접수 확인 후 sent(거부 시 failed)로 기록된다. 발송 이력 저장이
+    끝나면 checkpoint 로 로그를 다시 작성하여 재시도할 메시지만 남긴다.
+    접수 거부된 공고 알림은 max_attempts 회까지 다음 실행에서 재시도한다.
+    여러 그룹을 동시에 발송해도 기록은 잠금으로 보호된다.
+    """
+
+    def __init__(self, path=OUTBOX_FILE, max_attempts=OUTBOX_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', encoding="utf-8")
+
+    def _append(self, records):
+        """로그 기록 후 디스크 동기화"""
+        with self.lock:
+            for record in records:
+                self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def _apply(self, record):
+        """로그 한 줄을 메모리 상태에 반영"""
+        if record["op"] == "plan":
+            entry = self.entries.setdefault(record["id"], {"attempts": 0})
+            entry.update({k: v for k, v in record.items() if k != "op"}, state=STATE_PLANNED)
+            return
+        for entry_id in record["ids"]:
+            entry = self.entries.get(entry_id)
+            if entry is None:
+                continue
+            entry["state"] = record["op"]
+            if record["op"] == STATE_FAILED:
+                entry["attempts"] += 1
+
+    def plan(self, entries):
+        """발송 전 메시지 기록 - 각 entry 에 id 부여"""
+        records = []
+        for entry in entries:
+            if entry.get("id") is None:
+                entry["id"] = uuid.uuid4().hex
+            records.append({
+                "op": "plan",
+                "id": entry["id"],
+                "to": entry["to"],
+                "text": entry["text"],
+                "keys": entry["keys"],
+                "categories": entry["categories"],
+            })
+        if not records:
+            return
+        self._append(records)
+        with self.lock:
+            for record in records:
+                self._apply(record)
+
+    def mark(self, state, ids):
+        """메시지 상태 기록 (submitting / sent / failed)"""
+        if not ids:
+            return
+        record = {"op": state, "ids": list(ids)}
+        self._append([record])
+        with self.lock:
+            self._apply(record)
+
+    def load(self):
+        """로그를 다시 읽어 메시지별 최종 상태 목록 반환"""
+        with self.lock:
+            self.entries = {}
+            with open(self.path, 'r', encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 기록 도중 중단된 마지막 줄
+                        continue
+                    self._apply(record)
+            return [dict(entry) for entry in self.entries.values()]
+
+    def checkpoint(self):
+        """발송 이력 저장 후 호출 - 재시도 대상(발송 전·접수 거부)만 남기고 로그 재작성"""
+        with self.lock:
+            remaining = []
+            dropped = 0
+            for entry in self.entries.values():
+                if entry["state"] not in (STATE_PLANNED, STATE_FAILED):
+                    continue
+                # 공고 알림이 아닌 안내 메시지(keys 없음)는 접수 거부 시 재시도하지 않음
+                if entry["state"] == STATE_FAILED and not entry.get("keys"):
+                    continue
+                if entry["attempts"] >= self.max_attempts:
+                    dropped += 1
+                    continue
+                remaining.append(entry)
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding="utf-8") as f:
+                for entry in remaining:
+                    # 재시도 횟수(attempts)를 함께 보존
+                    record = {"op": "plan", **{k: entry[k] for k in ("id", "to", "text", "keys", "categories", "attempts")}}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.file.close()
+            os.replace(tmp_path, self.path)
+            self.file = open(self.path, 'a', encoding="utf-8")
+            self.entries = {entry["id"]: entry for entry in remaining}
+
+        if dropped:
+            print(f"[발송 대기 로그] {self.max_attempts}회 접수 거부된 메시지 {dropped}건 제외")
+        return len(remaining)
+
+    def close(self):
+        """로그 닫기"""
+        self.file.close()
+
+def open_outbox(shard=None):
+    """OUTBOX_FILE 설정에 따른 발송 대기 로그 생성 (샤드별 파일 사용)"""
+    return Outbox(
+        shard_path(os.getenv('OUTBOX_FILE', OUTBOX_FILE), shard),
+        max_attempts=int(os.getenv('OUTBOX_MAX_ATTEMPTS', str(OUTBOX_MAX_ATTEMPTS))),
+    )
@@ -0,0 +1,601 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable
+from common import *
+from matcher import NoticeIndex, as_list
+from conditions import compile_condition, describe_filters, needs_window
+from records import as_dict, make_record_type
+from delivery import DeliveryQueue, LazyMessageService, call_all, use_recording_fetcher
+from history import open_sent_history
+from outbox import STATE_PLANNED, STATE_FAILED, open_outbox
+from metrics import METRICS
+from events import EVENTS
+from followup import FOLLOWUP_FILE, collect_open_notices, followup_windows, load_followups, save_followups, update_tracked
+from sharding import shard_path
+from subscribers import open_subscriber_store
+from watermark import WATERMARK_FILE, load_watermarks, save_watermarks, watermark_windows
+
+@dataclass
+class NoticeType:
+    """공고 유형 설정
+
+    param_map 은 검색 조건 키를 API 요청 파라미터로, match_fields 는
+    검색 조건 키를 공고 항목 필드로 연결한다(구간 전체 조회 시 로컬 매칭용).
+    응답 항목은 record_fields·match_fields·id_field 만 보관하는 레코드로 변환된다.
+    price_field·deadline_field 는 검색 조건의 금액 범위·마감 시간 필터에 사용한다.
+    follow_up_key 가 지정되면 그 발송 이력(예: 입찰공고)의 공고 중 이 유형의
+    알림을 아직 받지 않은 공고를 같은 공고번호(id_field)로 추적한다.
+    """
+    type: str
+    label: str
+    api_url: str
+    history_key: str
+    id_field: str
+    param_map: dict
+    match_fields: dict
+    format_message: Callable
+    extra_params: dict = field(default_factory=dict)
+    format_compact: Callable = None
+    record_fields: tuple = ()
+    price_field: str = None
+    deadline_field: str = None
+    follow_up_key: str = None
+    record_type: type = field(init=False, repr=False)
+
+    def __post_init__(self):
+        fields = (
+            *self.record_fields, *self.match_fields.values(), self.id_field,
+            self.price_field, self.deadline_field,
+        )
+        self.record_type = make_record_type(f"{self.type.capitalize()}Record", fields)
+
+    def build_params(self, service_key, inqry_bgn_dt, inqry_end_dt, condition=None):
+        """API 요청 파라미터 구성 - condition 이 없으면 구간 전체 조회"""
+        params = {
+            "ServiceKey": service_key,
+            "inqryDiv": 1,
+            "inqryBgnDt": inqry_bgn_dt,
+            "inqryEndDt": inqry_end_dt,
+            **self.extra_params,
+            "type": "json"
+        }
+
+        # 검색 조건 파라미터 추가 (검색어가 하나인 항목만 - OR 목록은 로컬 매칭)
+        if condition:
+            for key, param in self.param_map.items():
+                values = as_list(condition.get(key))
+                if len(values) == 1:
+                    params[param] = values[0]
+        return params
+
+    def has_search_fields(self, condition):
+        """검색 조건에 유효한 조회 항목이 있는지 확인"""
+        return any(as_list(condition.get(key)) for key in self.param_map)
+
+class RunContext:
+    """실행 단위 공유 상태 (환경변수, 구독자 저장소, 발송 이력, 발송 대기열, 조회 구간)"""
+
+    def __init__(self, env_vars, subscribers, history, message_service, inqry_bgn_dt, inqry_end_dt, outbox=None,
+                 read_only=False):
+        self.env_vars = env_vars
+        self.subscribers = subscribers
+        self.history = history
+        self.message_service = message_service
+        self.outbox = outbox
+        # True 이면 문자 발송 없이 발송 이력만 반영 (backfill --silent)
+        self.silent = False
+        # True 이면 문자 발송과 발송 이력·상태 파일 기록 없이 실행 (응답 캐시 재생)
+        self.read_only = read_only
+        # 공고 유형별 후속 추적 상태 (AWARD_FOLLOWUP=1 일 때 run_pipeline 에서 로딩)
+        self.followups = None
+        self.set_window(inqry_bgn_dt, inqry_end_dt)
+
+    def set_window(self, inqry_bgn_dt, inqry_end_dt):
+        """새 조회 구간 설정 - 발송 대기열과 실패 기록 초기화"""
+        self.inqry_bgn_dt = inqry_bgn_dt
+        self.inqry_end_dt = inqry_end_dt
+        self.delivery_queue = DeliveryQueue(
+            self.message_service, self.env_vars['coolsms_sender'],
+            outbox=self.outbox, workers=self.env_vars['concurrency'],
+            silent=self.silent, digest=self.env_vars['digest'], read_only=self.read_only,
+        )
+        self.failed_types = set()
+        self.type_windows = None
+
+    def close(self):
+        """발송 이력·구독자 저장소·발송 대기 로그·이벤트 로그 닫기"""
+        EVENTS.close()
+        self.history.close()
+        self.subscribers.close()
+        if self.outbox is not None:
+            self.outbox.close()
+
+    def window_for(self, notice_type):
+        """공고 유형의 조회 구간 - 워터마크 모드에서 조회할 구간이 없으면 None"""
+        if self.type_windows is None:
+            return self.inqry_bgn_dt, self.inqry_end_dt
+        return self.type_windows.get(notice_type.type)
+
+def create_message_service(env_vars):
+    """CoolSMS(솔라피) 문자 발송 클라이언트 생성 (발송 오류 분류용 응답 상태 코드 기록)"""
+    from solapi import SolapiMessageService
+    use_recording_fetcher()
+    return SolapiMessageService(
+        api_key=env_vars['coolsms_api_key'],
+        api_secret=env_vars['coolsms_api_secret']
+    )
+
+def load_run_context(now=None, window=None, names=None, dry_run=False):
+    """환경변수·구독자·발송 이력을 한 번만 로딩하여 실행 컨텍스트 구성
+
+    names 를 지정하면 해당 사용자만 처리한다. 문자 발송 클라이언트는 첫
+    발송 시점에 생성하며, dry_run 이면 발송 대기 로그를 열지 않고 발송 이력·
+    구독자 저장소를 읽기 전용으로 연다(JSON 이력 이전·사용자 파일 동기화 없음).
+    응답 캐시 재생 모드(RESPONSE_CACHE_REPLAY=1)도 같은 방식으로 열고 문자를 보내지 않는다.
+    """
+    env_vars = load_environment()
+    read_only = dry_run or env_vars['replay']
+
+    # CoolSMS API 설정 (발송할 메시지가 있을 때 생성)
+    message_service = LazyMessageService(partial(create_message_service, env_vars))
+
+    # 배치 시간 구간 계산 (window 가 주어지면 그대로 사용)
+    if window is None:
+        now = now or current_time(env_vars)
+        print(f"현재 시각: {now}")
+        window = get_batch_time_ranges(now)
+    inqry_bgn_dt, inqry_end_dt = window
+    print(f"[배치 요청 시간 범위] {inqry_bgn_dt} ~ {inqry_end_dt}")
+
+    # 샤드 모드: 사용자 이름 해시로 나눈 일부 사용자만 처리
+    shard = env_vars['shard']
+
+    # EVENT_LOG 설정 시 구조화 이벤트 로그 기록 (표준 출력 '-' 이 아니면 샤드별 파일)
+    event_log = env_vars['event_log']
+    EVENTS.configure(
+        event_log if event_log == "-" else shard_path(event_log, shard),
+        env_vars['event_level'], env_vars['event_sample_rate'],
+        secrets=(env_vars['service_key'], env_vars['coolsms_api_key'], env_vars['coolsms_api_secret']),
+    )
+    with METRICS.stage("load"):
+        subscribers = open_subscriber_store(shard, names, read_only=read_only)
+        if shard:
+            print(f"[샤드 {shard}] 사용자 {subscribers.user_count}명 처리")
+        return RunContext(
+            env_vars=env_vars,
+            subscribers=subscribers,
+            history=open_sent_history(read_only=read_only),
+            message_service=message_service,
+            inqry_bgn_dt=inqry_bgn_dt,
+            inqry_end_dt=inqry_end_dt,
+            outbox=None if read_only else open_outbox(shard),
+            read_only=read_only,
+        )
+
+def recover_outbox(ctx):
+    """이전 실행이 남긴 발송 대기 로그 복구
+
+    접수 완료(sent) 또는 접수 여부를 알 수 없는(submitting) 메시지는
+    재발송하지 않고 발송 이력에만 반영하며(최대 1회 발송), 발송 전(planned)
+    또는 접수 거부(failed) 메시지는 발송 대기열에 다시 등록한다.
+    이력만 반영하는 재처리(silent)는 실제 알림을 발송하지 않으므로 복구하지
+    않고 다음 일반 실행에 맡긴다.
+    """
+    if ctx.outbox is None or ctx.silent:
+        return
+    recorded = requeued = 0
+    for entry in ctx.outbox.load():
+        # 요약 메시지는 여러 공고 알림(keys)을 담고 있음
+        keys = [tuple(key) for key in entry.get("keys") or []]
+        on_sent = partial(call_all, [partial(ctx.history.add, name, history_key, notice_no)
+                                     for history_key, name, notice_no in keys])
+
+        if entry["state"] not in (STATE_PLANNED, STATE_FAILED):
+            on_sent()
+            recorded += 1
+        elif entry["attempts"] < ctx.outbox.max_attempts:
+            ctx.delivery_queue.restore(entry, on_sent)
+            requeued += 1
+
+    if recorded or requeued:
+        ctx.history.commit()
+        print(f"[발송 대기 로그] 이전 실행 복구: 이력 반영 {recorded}건, 재발송 대기 {requeued}건")
+
+def build_window_index(ctx, notice_type):
+    """구간 전체를 한 번 조회하여 로컬 매칭 인덱스 구성 - 실패 시 None
+
+    조건별 조회 모드에서는 OR 목록 조건이 있을 때만 호출되며,
+    조건 수와 관계없이 구간 조회 한 번으로 모든 OR 조건을 매칭한다.
+    """
+    service_key = ctx.env_vars['service_key']
+    inqry_bgn_dt, inqry_end_dt = ctx.window_for(notice_type)
+    window_params = notice_type.build_params(service_key, inqry_bgn_dt, inqry_end_dt)
+    all_conditions = ctx.subscribers.conditions(notice_type.type)
+    try:
+        # 페이지 도착 즉시 인덱스에 반영
+        window_items = iter_api_items(notice_type.api_url, window_params, notice_type.label, notice_type.record_type)
+        window_index = NoticeIndex(window_items, notice_type.match_fields, all_conditions)
+    except ApiRequestError as e:
+        print(f"구간 전체 조회 실패로 알림을 건너뜁니다: {e}")
+        return None
+    print(f"[{notice_type.label}] 구간 전체 조회 결과: {len(window_index.items)}건")
+    METRICS.inc("bidnotice_items_total", len(window_index.items), notice_type=notice_type.type, outcome="fetched")
+    return window_index
+
+def prefetch_conditions(ctx, notice_type):
+    """조건별 조회를 미리 요청하여 요청 캐시에 적재 (concurrency 개 작업자로 병렬 요청)"""
+    service_key = ctx.env_vars['service_key']
+    inqry_bgn_dt, inqry_end_dt = ctx.window_for(notice_type)
+    condition_params = [
+        notice_type.build_params(service_key, inqry_bgn_dt, inqry_end_dt, c)
+        for c in ctx.subscribers.conditions(notice_type.type)
+        if notice_type.has_search_fields(c) and not needs_window(c, notice_type)
+    ]
+    fetched = prefetch_api_requests(
+        notice_type.api_url, condition_params, notice_type.label,
+        ctx.env_vars['concurrency'], notice_type.record_type,
+    )
+    METRICS.inc("bidnotice_items_total", fetched, notice_type=notice_type.type, outcome="fetched")
+
+def process_notice_type(ctx, notice_type):
+    """공고 유형 하나의 조회·매칭·중복 확인 후 발송 대기열 등록"""
+    window = ctx.window_for(notice_type)
+    if window is None:
+        print(f"[{notice_type.label}] 새로 조회할 구간이 없습니다.")
+        return
+    inqry_bgn_dt, inqry_end_dt = window
+
+    conditions = ctx.subscribers.conditions(notice_type.type)
+    if not conditions:
+        # 조회·매칭할 검색 조건이 없으면 구간 전체 조회도 하지 않음 (후속 확인은 진행)
+        print(f"[{notice_type.label}] 검색 조건이 없습니다.")
+    elif not search_notice_type(ctx, notice_type, conditions, inqry_bgn_dt, inqry_end_dt):
+        return
+
+    # 이미 알림을 보낸 공고의 결과 추적 (예: 입찰공고 → 낙찰 결과)
+    if ctx.followups is not None and notice_type.follow_up_key:
+        with METRICS.stage("follow_up", notice_type=notice_type.type):
+            follow_up_notices(ctx, notice_type, ctx.followups.setdefault(notice_type.type, {}))
+
+def search_notice_type(ctx, notice_type, conditions, inqry_bgn_dt, inqry_end_dt):
+    """검색 조건 조회·매칭 단계 - 구간 전체 조회 실패 시 False"""
+    window_mode = ctx.env_vars['fetch_mode'] == FETCH_MODE_WINDOW
+    with METRICS.stage("fetch", notice_type=notice_type.type):
+        # 구간 전체 조회 모드 또는 OR 목록 조건: 공고 유형별로 한 번만 조회 후 로컬 매칭
+        window_index = None
+        if window_mode or any(needs_window(c, notice_type) for c in conditions):
+            window_index = build_window_index(ctx, notice_type)
+            if window_index is None:
+                ctx.failed_types.add(notice_type.type)
+                return False
+
+        # 조건별 조회 모드: 서로 다른 조회를 미리 요청하여 요청 캐시에 적재
+        if not window_mode:
+            prefetch_conditions(ctx, notice_type)
+
+    with METRICS.stage("match", notice_type=notice_type.type):
+        match_notice_type(ctx, notice_type, conditions, window_index, inqry_bgn_dt, inqry_end_dt, window_mode)
+    return True
+
+def match_notice_type(ctx, notice_type, conditions, window_index, inqry_bgn_dt, inqry_end_dt, window_mode=True):
+    """검색 조건별 매칭 후 구독자별 중복 확인·발송 대기열 등록
+
+    구독자 저장소의 서로 다른 검색 조건만 한 번씩 컴파일·매칭하고,
+    결과는 그 조건을 구독한 사용자 모두에게 적용한다.
+    """
+    service_key = ctx.env_vars['service_key']
+    delivery_queue = ctx.delivery_queue
+    history = ctx.history
+    now = current_time(ctx.env_vars)
+    digest = ctx.env_vars['digest'] and notice_type.format_compact is not None
+    result_limit = ctx.env_vars['digest_result_limit'] if digest else 5
+
+    # 검색 조건별 API 요청 또는 로컬 매칭
+    for condition in conditions:
+        if not notice_type.has_search_fields(condition):
+            print(f"[{notice_type.label}] 검색 조건이 없어 건너뜀")
+            continue
+
+        # 검색 조건 설명 생성
+        search_desc = build_search_description(
+            condition.get('keyword'),
+            condition.get('notice_org'),
+            condition.get('demand_org'),
+            condition.get('notice_number'),
+        )
+        filter_desc = describe_filters(condition)
+        if filter_desc:
+            search_desc = f"{search_desc} ({filter_desc})"
+
+        # 매칭 후 로컬 필터 적용
+        if window_index is not None and (window_mode or needs_window(condition, notice_type)):
+            items = compile_condition(condition, notice_type, now).filter(window_index.match(condition))
+            print(f"[{notice_type.label}] 조회 {search_desc} 결과: {len(items)}건")
+        else:
+            params = notice_type.build_params(service_key, inqry_bgn_dt, inqry_end_dt, condition)
+            items = make_api_request(notice_type.api_url, params, notice_type.label, search_desc, notice_type.record_type)
+            if items is not None:
+                items = compile_condition(condition, notice_type, now).filter(items)
+
+        if items is None:
+            ctx.failed_types.add(notice_type.type)
+
+        if items is None or not items:
+            print("-" * 40)
+            continue
+
+        # 조건을 구독한 사용자별 알림 처리
+        for name, phone in ctx.subscribers.subscribers(notice_type.type, condition):
+            METRICS.inc("bidnotice_items_total", len(items), notice_type=notice_type.type, outcome="matched")
+
+            # 결과가 5개 초과인 경우 제한 메시지 전송 (요약 발송 모드는 요약 한도 초과 시)
+            # 이력만 반영하는 재처리(silent)는 결과 수와 관계없이 모두 기록
+            if not ctx.silent and check_result_limit_and_notify(items, delivery_queue, phone, search_desc, limit=result_limit):
+                METRICS.inc("bidnotice_items_total", len(items), notice_type=notice_type.type, outcome="suppressed")
+                continue
+
+            new_notices = 0
+            for item in items:
+                notice_no = item.get(notice_type.id_field)
+
+                # 중복 알림 방지
+                if history.contains(name, notice_type.history_key, notice_no):
+                    METRICS.inc("bidnotice_items_total", notice_type=notice_type.type, outcome="deduped")
+                    EVENTS.debug("notice.deduped", user=name, notice_type=notice_type.type, notice_no=notice_no)
+                    continue
+
+                # 메시지 내용 구성 및 발송 대기열 등록 (접수 확인 후 발송 이력 반영)
+                msg_text = notice_type.format_message(item)
+
+                if delivery_queue.add(
+                    phone, msg_text,
+                    key=(notice_type.history_key, name, notice_no),
+                    on_sent=partial(history.add, name, notice_type.history_key, notice_no),
+                    category=notice_type.type,
+                    line=notice_type.format_compact(item) if digest else None,
+                ):
+                    new_notices += 1
+                    METRICS.inc("bidnotice_items_total", notice_type=notice_type.type, outcome="queued")
+                    EVENTS.info(
+                        "notice.queued", user=name, notice_type=notice_type.type, notice_no=notice_no,
+                        condition=search_desc, item=partial(as_dict, item),
+                    )
+
+            if new_notices == 0:
+                EVENTS.debug("notice.all_sent", user=name, notice_type=notice_type.type, condition=search_desc)
+
+        print("-" * 40)
+
+def follow_up_notices(ctx, notice_type, state, now=None):
+    """추적 중인 공고의 결과를 구간 조회 몇 번으로 확인하여 발송 대기열 등록
+
+    공고번호마다 요청하지 않고 마지막 확인 시점부터 현재까지를
+    FOLLOWUP_CHUNK_DAYS 단위 구간 전체 조회로 받아 공고번호로 로컬 매칭한다.
+    결과가 확인된 공고는 추적 대상에서 제외되며, 조회에 실패하면 상태를
+    바꾸지 않고 다음 실행에서 같은 구간을 다시 조회한다.
+    """
+    env_vars = ctx.env_vars
+    now = (now or current_time(ctx.env_vars)).replace(second=0, microsecond=0)
+    open_notices = collect_open_notices(
+        ctx.history, ctx.subscribers, notice_type.follow_up_key, notice_type.history_key,
+    )
+    tracked = dict(state.get('tracked', {}))
+    candidate = dict(state, tracked=tracked)
+    scan_from = update_tracked(
+        candidate, open_notices, now,
+        env_vars['award_followup_lookback_days'], env_vars['award_followup_max_days'],
+    )
+    windows = followup_windows(scan_from, now) if tracked else []
+    print(f"[{notice_type.label} 후속 확인] 추적 {len(tracked)}건, 조회 구간 {len(windows)}개")
+
+    resolved = []
+    try:
+        for bgn, end in windows:
+            params = notice_type.build_params(env_vars['service_key'], bgn, end)
+            for item in iter_api_items(notice_type.api_url, params, notice_type.label, notice_type.record_type):
+                notice_no = item.get(notice_type.id_field)
+                if notice_no in tracked:
+                    resolved.append((item, tracked.pop(notice_no)['users']))
+    except ApiRequestError as e:
+        print(f"[{notice_type.label} 후속 확인] 조회 실패로 다음 실행에서 재시도합니다: {e}")
+        return
+
+    digest = env_vars['digest'] and notice_type.format_compact is not None
+    queued = 0
+    for item, names in resolved:
+        notice_no = item.get(notice_type.id_field)
+        for name in names:
+            phone = ctx.subscribers.phone_of(name)
+            if phone is None or ctx.history.contains(name, notice_type.history_key, notice_no):
+                continue
+            if ctx.delivery_queue.add(
+                phone, notice_type.format_message(item),
+                key=(notice_type.history_key, name, notice_no),
+                on_sent=partial(ctx.history.add, name, notice_type.history_key, notice_no),
+                category=notice_type.type,
+                line=notice_type.format_compact(item) if digest else None,
+            ):
+                queued += 1
+                EVENTS.info(
+                    "notice.queued", user=name, notice_type=notice_type.type, notice_no=notice_no,
+                    follow_up=notice_type.follow_up_key, item=partial(as_dict, item),
+                )
+    METRICS.inc("bidnotice_items_total", len(resolved), notice_type=notice_type.type, outcome="resolved")
+    METRICS.inc("bidnotice_items_total", queued, notice_type=notice_type.type, outcome="queued")
+    print(f"[{notice_type.label} 후속 확인] 결과 확인 {len(resolved)}건, 알림 {queued}건 등록")
+
+    candidate['checked_until'] = now.strftime(TIME_FORMAT)
+    state.clear()
+    state.update(candidate)
+
+def apply_watermark_windows(ctx, notice_types, watermark_file):
+    """워터마크 모드이면 공고 유형별 조회 구간 설정 - 워터마크 dict 반환 (아니면 None)"""
+    if ctx.env_vars['window_mode'] != WINDOW_MODE_WATERMARK:
+        return None
+    watermarks = load_watermarks(watermark_file)
+    ctx.type_windows = watermark_windows(
+        watermarks, [nt.type for nt in notice_types], current_time(ctx.env_vars),
+        ctx.env_vars['watermark_max_lookback_days'],
+    )
+    for type_name, (bgn, end) in ctx.type_windows.items():
+        print(f"[{type_name} 워터마크 조회 구간] {bgn} ~ {end}")
+    return watermarks
+
+def prefetch_shard_windows(notice_types, env_vars, now, count, window=None):
+    """샤드 실행 전 구간 전체 조회를 부모 프로세스에서 한 번만 요청 - 조회한 구간 수 반환
+
+    샤드마다 계산할 조회 구간(지정 구간, 샤드별 워터마크 구간 또는 배치 구간)을
+    같은 기준 시각(now)으로 구하여 서로 다른 구간만 조회한다. 응답은 원본 응답
+    캐시에 저장되어 샤드 작업 프로세스가 API 를 다시 호출하지 않고 사용한다.
+    """
+    windows = {nt.type: set() for nt in notice_types}
+    if window is not None:
+        for type_windows in windows.values():
+            type_windows.add(tuple(window))
+    elif env_vars['window_mode'] == WINDOW_MODE_WATERMARK:
+        for index in range(count):
+            watermarks = load_watermarks(shard_path(WATERMARK_FILE, f"{index}/{count}"))
+            shard_windows = watermark_windows(watermarks, list(windows), now, env_vars['watermark_max_lookback_days'])
+            for type_name, type_window in shard_windows.items():
+                windows[type_name].add(type_window)
+    else:
+        batch_window = get_batch_time_ranges(now)
+        for type_windows in windows.values():
+            type_windows.add(batch_window)
+
+    fetched = 0
+    for notice_type in notice_types:
+        for inqry_bgn_dt, inqry_end_dt in sorted(windows[notice_type.type]):
+            params = notice_type.build_params(env_vars['service_key'], inqry_bgn_dt, inqry_end_dt)
+            try:
+                item_count = sum(1 for _ in iter_api_items(notice_type.api_url, params, notice_type.label, notice_type.record_type))
+            except ApiRequestError as e:
+                # 응답 캐시에 없는 구간은 샤드 작업 프로세스가 직접 조회
+                print(f"[샤드 공용 조회] {e}")
+                continue
+            fetched += 1
+            print(f"[샤드 공용 조회] {notice_type.label} {inqry_bgn_dt} ~ {inqry_end_dt}: {item_count}건")
+    return fetched
+
+def plan_pipeline(notice_types, ctx):
+    """실행 계획 출력 (dry-run) - API 요청·문자 발송·상태 파일 갱신 없이 유형별 계획 dict 반환
+
+    조회 구간, 서로 다른 검색 조건 수, 구독 수, 예상 API 조회 수(페이지 제외)를 보여준다.
+    """
+    apply_watermark_windows(ctx, notice_types, shard_path(WATERMARK_FILE, ctx.env_vars['shard']))
+    service_key = ctx.env_vars['service_key']
+    window_mode = ctx.env_vars['fetch_mode'] == FETCH_MODE_WINDOW
+
+    plans = {}
+    for notice_type in notice_types:
+        window = ctx.window_for(notice_type)
+        if window is None:
+            print(f"[계획] {notice_type.label}: 새로 조회할 구간이 없습니다.")
+            continue
+        inqry_bgn_dt, inqry_end_dt = window
+        conditions = ctx.subscribers.conditions(notice_type.type)
+        subscriptions = sum(len(ctx.subscribers.subscribers(notice_type.type, c)) for c in conditions)
+
+        # 구간 전체 조회 1회 + 조건별 조회(같은 조회는 요청 캐시로 한 번만)
+        window_fetches = int(bool(conditions) and (window_mode or any(needs_window(c, notice_type) for c in conditions)))
+        condition_fetches = 0 if window_mode else len({
+            make_request_key(notice_type.api_url, notice_type.build_params(service_key, inqry_bgn_dt, inqry_end_dt, c))
+            for c in conditions
+            if notice_type.has_search_fields(c) and not needs_window(c, notice_type)
+        })
+        plan = {
+            "window": window,
+            "conditions": len(conditions),
+            "subscriptions": subscriptions,
+            "window_fetches": window_fetches,
+            "condition_fetches": condition_fetches,
+        }
+        print(
+            f"[계획] {notice_type.label} {inqry_bgn_dt} ~ {inqry_end_dt}: 검색 조건 {len(conditions)}개, "
+            f"구독 {subscriptions}건, 구간 전체 조회 {window_fetches}건, 조건별 조회 {condition_fetches}건"
+        )
+
+        if ctx.env_vars['award_followup'] and notice_type.follow_up_key:
+            open_notices = collect_open_notices(
+                ctx.history, ctx.subscribers, notice_type.follow_up_key, notice_type.history_key,
+            )
+            plan["follow_up"] = len(open_notices)
+            print(f"[계획] {notice_type.label} 후속 확인 대상 {len(open_notices)}건")
+        plans[notice_type.type] = plan
+    return plans
+
+def run_pipeline(notice_types, ctx=None):
+    """공고 유형 목록 실행 - 발송과 이력 저장은 마지막에 한 번만 수행
+
+    ctx 를 넘기지 않으면 실행 컨텍스트를 새로 만들고 종료 시 닫는다.
+    조회에 실패한 공고 유형은 ctx.failed_types 에 기록된다.
+    """
+    run_started = time.perf_counter()
+    owns_context = ctx is None
+    if owns_context:
+        ctx = load_run_context()
+    concurrency = ctx.env_vars['concurrency']
+
+    if concurrency > 1:
+        set_api_concurrency(concurrency)
+
+    # 이전 실행이 중단된 경우 발송 대기 로그에서 이어서 처리
+    recover_outbox(ctx)
+
+    # 후속 추적 모드: 공고 유형별 추적 상태 로딩 (샤드별 파일)
+    followup_file = shard_path(FOLLOWUP_FILE, ctx.env_vars['shard'])
+    if ctx.env_vars['award_followup']:
+        ctx.followups = load_followups(followup_file)
+
+    # 워터마크 모드: 공고 유형별로 마지막 처리 시점부터 현재까지 조회 (샤드별 워터마크)
+    watermark_file = shard_path(WATERMARK_FILE, ctx.env_vars['shard'])
+    watermarks = apply_watermark_windows(ctx, notice_types, watermark_file)
+
+    if concurrency > 1 and len(notice_types) > 1:
+        # 동시 실행 모드: 공고 유형별 병렬 처리
+        with ThreadPoolExecutor(max_workers=len(notice_types)) as executor:
+            for future in [executor.submit(process_notice_type, ctx, nt) for nt in notice_types]:
+                future.result()
+    else:
+        for notice_type in notice_types:
+            process_notice_type(ctx, notice_type)
+
+    # 대기 중인 메시지 일괄 발송
+    with METRICS.stage("send"):
+        accepted = ctx.delivery_queue.flush()
+
+    # 전체 발송 이력 저장 (읽기 전용 실행은 발송 이력·후속 추적·워터마크를 저장하지 않음)
+    with METRICS.stage("save"):
+        if not ctx.read_only:
+            ctx.history.commit()
+            # silent 실행은 발송 대기 로그를 읽지 않았으므로 로그를 다시 작성하지 않음
+            if ctx.outbox is not None and not ctx.silent:
+                ctx.outbox.checkpoint()
+            if ctx.followups is not None:
+                save_followups(ctx.followups, followup_file)
+        if owns_context:
+            ctx.close()
+
+    # 조회에 성공한 공고 유형만 워터마크 전진 (발송 이력 저장 이후)
+    if watermarks is not None and not ctx.read_only:
+        for type_name, (_, end) in ctx.type_windows.items():
+            if type_name not in ctx.failed_types:
+                watermarks[type_name] = end
+        save_watermarks(watermarks, watermark_file)
+
+    action = "발송 예정 (읽기 전용)" if ctx.read_only else "발송"
+    for notice_type in notice_types:
+        print(f"* 총 {accepted.get(notice_type.type, 0)} 건의 새로운 {notice_type.label} 알림 {action}")
+    print()
+    print_request_cache_stats()
+    print_api_client_stats()
+    EVENTS.flush()
+
+    # 실행 지표 기록 (METRICS_FILE 설정 시 Prometheus 텍스트 파일 저장)
+    METRICS.set("bidnotice_last_run_duration_seconds", time.perf_counter() - run_started)
+    METRICS.set("bidnotice_last_run_timestamp_seconds", time.time())
+    if ctx.env_vars['metrics_file']:
+        METRICS.write_textfile(shard_path(ctx.env_vars['metrics_file'], ctx.env_vars['shard']))
+    return accepted
@@ -0,0 +1,77 @@
+import cProfile
+import os
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from metrics import METRICS
+
+# 단계별 상위 메모리 할당 위치 출력 수
+TOP_ALLOCATIONS = 20
+
+class StageProfiler:
+    """파이프라인 단계별 cProfile·tracemalloc 수집기
+
+    단계마다 <단계>.prof(cProfile)와 <단계>.alloc.txt(할당 상위 위치)를
+    output_dir 에 저장한다. 같은 단계가 여러 번 실행되면 번호를 붙인다.
+    cProfile 은 단계를 실행한 스레드만 측정한다.
+    """
+
+    def __init__(self, output_dir, top=TOP_ALLOCATIONS, frames=1):
+        self.output_dir = output_dir
+        self.top = top
+        self.lock = threading.Lock()
+        self.counts = {}
+        os.makedirs(output_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def _base_path(self, name):
+        """단계 결과 파일 경로 (확장자 제외)"""
+        with self.lock:
+            count = self.counts.get(name, 0)
+            self.counts[name] = count + 1
+        filename = name if count == 0 else f"{name}.{count}"
+        return os.path.join(self.output_dir, filename)
+
+    @contextmanager
+    def profile(self, stage, **labels):
+        """단계 실행 구간 프로파일링"""
+        name = "-".join([stage] + [str(v) for _, v in sorted(labels.items())])
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 다른 스레드에서 프로파일러가 동작 중인 경우 (Python 3.12+)
+            profiler = None
+        before = tracemalloc.take_snapshot()
+
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            after = tracemalloc.take_snapshot()
+            self._write(name, profiler, after.compare_to(before, "lineno"))
+
+    def _write(self, name, profiler, allocation_diff):
+        """단계 결과 저장"""
+        base_path = self._base_path(name)
+        if profiler is not None:
+            profiler.dump_stats(f"{base_path}.prof")
+
+        with open(f"{base_path}.alloc.txt", "w", encoding="utf-8") as f:
+            f.write(f"# {name} 단계 메모리 할당 상위 {self.top}개 (단계 시작 대비 증가량)\n")
+            for stat in allocation_diff[:self.top]:
+                f.write(f"{stat}\n")
+            if profiler is not None:
+                f.write(f"\n# {name} 단계 누적 시간 상위 {self.top}개 함수\n")
+                stats = pstats.Stats(profiler, stream=f)
+                stats.sort_stats("cumulative").print_stats(self.top)
+
+def enable_profiling(output_dir):
+    """모든 파이프라인 단계에 프로파일링 적용"""
+    profiler = StageProfiler(output_dir)
+    METRICS.add_stage_hook(profiler.profile)
+    print(f"[프로파일링] 단계별 결과를 {output_dir} 에 저장합니다.")
+    return profiler
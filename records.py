@@ -0,0 +1,90 @@
+import json
+
+try:
+    import ijson
+except ImportError:
+    # ijson 미설치 시 응답 전체를 한 번에 해석
+    ijson = None
+
+ERROR_ROOT = "nkoneps.com.response.ResponseError"
+ITEM_PREFIX = "response.body.items.item"
+TOTAL_COUNT_PREFIX = "response.body.totalCount"
+
+# JSON 해석 실패로 처리할 예외
+PARSE_ERRORS = (ValueError,) + ((ijson.JSONError,) if ijson is not None else ())
+
+class NoticeRecord:
+    """공고 항목에서 필요한 필드만 보관하는 레코드 (dict 와 같은 get 제공)
+
+    응답에 없던 필드는 슬롯을 비워 두어 get 의 기본값이 그대로 반환된다.
+    """
+    __slots__ = ()
+
+    def __init__(self, item):
+        for field in self.__slots__:
+            if field in item:
+                setattr(self, field, item[field])
+
+    def get(self, key, default=None):
+        """필드 값 반환 - 없으면 default"""
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.__slots__ if hasattr(self, f))
+        return f"{type(self).__name__}({fields})"
+
+def as_dict(item):
+    """레코드 또는 dict 항목의 필드 dict (이벤트 로그용)"""
+    if isinstance(item, NoticeRecord):
+        return {f: getattr(item, f) for f in item.__slots__ if hasattr(item, f)}
+    return dict(item)
+
+def make_record_type(name, fields):
+    """공고 유형별 레코드 클래스 생성 (중복 필드 제거)"""
+    slots = tuple(dict.fromkeys(f for f in fields if f))
+    return type(name, (NoticeRecord,), {"__slots__": slots})
+
+def _parse_error(code, message):
+    """API 오류 정보"""
+    return {"resultCode": code, "resultMsg": message}
+
+def parse_page(stream, record_type=None):
+    """응답 스트림 해석 - (레코드 목록, 전체 건수, API 오류 정보 또는 None)
+
+    ijson 이 있으면 response.body.items 배열을 항목 단위로 읽어 바로
+    레코드로 변환하므로 응답 전체를 dict 로 만들지 않는다.
+    JSON 이 아니면 PARSE_ERRORS 예외가 발생한다.
+    """
+    project = record_type or dict
+    if ijson is None:
+        data = json.load(stream)
+        if ERROR_ROOT in data:
+            header = data[ERROR_ROOT].get("header", {})
+            return [], 0, _parse_error(header.get("resultCode"), header.get("resultMsg"))
+        body = data.get("response", {}).get("body", {})
+        items = [project(item) for item in body.get("items") or []]
+        return items, int(body.get("totalCount") or len(items)), None
+
+    items = []
+    total_count = None
+    error = None
+    builder = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        # 항목 객체: 시작~끝 이벤트를 모아 레코드로 변환
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == ITEM_PREFIX and event == "end_map":
+                items.append(project(builder.value))
+                builder = None
+        elif prefix == ITEM_PREFIX and event == "start_map":
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == TOTAL_COUNT_PREFIX and event in ("number", "string"):
+            total_count = int(value or 0)
+        elif prefix.startswith(ERROR_ROOT + ".header.") and event == "string":
+            error = error or _parse_error(None, None)
+            error[prefix.rsplit(".", 1)[-1]] = value
+
+    if error is not None:
+        return [], 0, error
+    return items, total_count if total_count is not None else len(items), None
@@ -0,0 +1,91 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+
+# 원본 API 응답 디스크 캐시 설정
+RESPONSE_CACHE_DIR = os.path.join(".cache", "responses")
+EXCLUDED_PARAMS = ("ServiceKey",)
+
+class ResponseCache:
+    """gzip 압축 원본 API 응답 디스크 캐시
+
+    엔드포인트와 정규화한 요청 파라미터(조회 구간·페이지 포함)의 해시를
+    파일명으로 사용하며, 보관 기간과 전체 용량 기준으로 오래된 응답을 정리한다.
+    replay 모드에서는 캐시된 응답만 사용하고 API 를 호출하지 않는다.
+    """
+
+    def __init__(self, directory=RESPONSE_CACHE_DIR, max_bytes=200 * 1024 * 1024,
+                 max_age_seconds=24 * 3600, replay=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.replay = replay
+        os.makedirs(directory, exist_ok=True)
+        self.evict()
+
+    def make_key(self, api_url, params):
+        """캐시 키(SHA-256) 생성"""
+        normalized = sorted(
+            (key, str(value).strip())
+            for key, value in params.items()
+            if key not in EXCLUDED_PARAMS and value is not None
+        )
+        raw = json.dumps([api_url, normalized], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        """캐시 파일 경로"""
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def open(self, api_url, params):
+        """캐시된 응답(JSON 바이트) 스트림 반환 - 없거나 만료되었으면 None"""
+        path = self._path(self.make_key(api_url, params))
+        try:
+            if not self.replay and time.time() - os.path.getmtime(path) > self.max_age_seconds:
+                return None
+            return gzip.open(path, "rb")
+        except OSError:
+            return None
+
+    def put(self, api_url, params, content):
+        """원본 응답 바이트 저장 (임시 파일 작성 후 교체)"""
+        path = self._path(self.make_key(api_url, params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def evict(self):
+        """보관 기간 경과 및 용량 초과 응답 정리 - 삭제 건수 반환"""
+        if self.replay:
+            return 0
+
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        removed = 0
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries):
+            if now - mtime <= self.max_age_seconds and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        if removed:
+            print(f"[응답 캐시] 오래된 응답 {removed}건 정리")
+        return removed
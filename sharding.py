@@ -0,0 +1,48 @@
+import hashlib
+import os
+import subprocess
+import sys
+
+def parse_shard(spec):
+    """'i/N' 형식 샤드 지정 해석 - (i, N) 반환 (0 <= i < N)"""
+    index, _, count = str(spec).partition("/")
+    index, count = int(index), int(count)
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"잘못된 샤드 지정: {spec} (0 <= i < N 인 i/N 형식)")
+    return index, count
+
+def shard_of(name, count):
+    """사용자 이름의 샤드 번호 - 프로세스·호스트가 달라도 같은 값"""
+    digest = hashlib.md5(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+def shard_path(path, shard):
+    """샤드별 상태 파일 경로 (예: outbox.jsonl → outbox.shard0-4.jsonl)"""
+    if not shard or not path:
+        return path
+    index, count = parse_shard(shard)
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard{index}-{count}{ext}"
+
+def run_shards(count, script, args_for):
+    """샤드별 하위 프로세스 실행 후 모두 끝날 때까지 대기 - 실패한 샤드 번호 목록 반환
+
+    각 프로세스는 SHARD 환경변수로 자신의 샤드를 전달받고,
+    API 요청 속도 제한(API_RATE_LIMIT)은 샤드 수로 나누어 전체 한도를 유지한다.
+    """
+    rate_limit = float(os.getenv('API_RATE_LIMIT', '20'))
+    processes = []
+    for index in range(count):
+        env = dict(os.environ, SHARD=f"{index}/{count}")
+        if rate_limit > 0:
+            env['API_RATE_LIMIT'] = str(rate_limit / count)
+        processes.append(subprocess.Popen([sys.executable, script, *args_for(index)], env=env))
+    print(f"[샤드] 작업 프로세스 {count}개 실행")
+
+    failed = []
+    for index, process in enumerate(processes):
+        if process.wait() != 0:
+            failed.append(index)
+            print(f"[샤드 {index}/{count}] 비정상 종료 (코드 {process.returncode})")
+    print(f"[샤드] 완료: 성공 {count - len(failed)}개 / 실패 {len(failed)}개")
+    return failed
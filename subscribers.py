@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from common import USERS_FILE
+from conditions import condition_key
+from records import ijson
+from sharding import parse_shard, shard_of
+
+# 구독자 저장소 설정
+USERS_BACKEND_JSON = "json"
+USERS_BACKEND_SQLITE = "sqlite"
+USERS_DB_FILE = "users.db"
+
+def iter_users(path=USERS_FILE):
+    """사용자 정보 스트림 - users.jsonl 은 한 줄씩, users.json 은 ijson 이 있으면 항목 단위로 읽음"""
+    with open(path, 'rb') as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif ijson is not None:
+            yield from ijson.items(f, "item", use_float=True)
+        else:
+            yield from json.load(f)
+
+def user_selector(shard=None, names=None):
+    """처리 대상 사용자 판별 함수 (샤드·이름 제한)"""
+    shard = parse_shard(shard) if shard else None
+    names = set(names) if names else None
+
+    def selected(name):
+        if names is not None and name not in names:
+            return False
+        return shard is None or shard_of(name, shard[1]) == shard[0]
+    return selected
+
+class JsonSubscriberStore:
+    """users.json / users.jsonl 기반 구독자 저장소
+
+    사용자 목록을 스트림으로 읽으며 (공고 유형, 정규화한 검색 조건) →
+    구독자(이름, 전화번호) 색인만 메모리에 구성한다.
+    """
+
+    def __init__(self, path=USERS_FILE, shard=None, names=None):
+        self.path = path
+        self.selected = user_selector(shard, names)
+        self.index = {}
+        self.phones = {}
+        self.user_count = 0
+        self.reload()
+
+    def reload(self):
+        """사용자 파일을 다시 읽어 색인 재구성 - 처리 대상 사용자 수 반환"""
+        index = {}
+        phones = {}
+        for user in iter_users(self.path):
+            if not self.selected(user['name']):
+                continue
+            phones[user['name']] = user['phone']
+            subscriber = (user['name'], user['phone'])
+            for condition in user.get('search_conditions', []):
+                by_key = index.setdefault(condition.get('type'), {})
+                by_key.setdefault(condition_key(condition), (condition, []))[1].append(subscriber)
+        self.index = index
+        self.phones = phones
+        self.user_count = len(phones)
+        return self.user_count
+
+    def conditions(self, notice_type):
+        """공고 유형의 서로 다른 검색 조건 목록"""
+        return [condition for condition, _ in self.index.get(notice_type, {}).values()]
+
+    def subscribers(self, notice_type, condition):
+        """검색 조건 구독자 (이름, 전화번호) 목록"""
+        entry = self.index.get(notice_type, {}).get(condition_key(condition))
+        return entry[1] if entry else []
+
+    def phone_of(self, name):
+        """처리 대상 사용자의 전화번호 - 없으면 None"""
+        return self.phones.get(name)
+
+    def close(self):
+        """저장소 닫기"""
+
+class SqliteSubscriberStore:
+    """SQLite 기반 구독자 저장소
+
+    subscriptions 테이블의 (공고 유형, 조건 키) 기본 키가 검색 조건 → 구독자
+    색인 역할을 하며, 조회 시 사용자 전체를 메모리에 올리지 않는다.
+    사용자 파일이 바뀌면 내용이 달라진 사용자의 구독만 다시 기록한다.
+    """
+
+    def __init__(self, path=USERS_DB_FILE, source=USERS_FILE, shard=None, names=None, read_only=False):
+        self.source = source
+        self.selected = user_selector(shard, names)
+        self.lock = threading.Lock()
+        if read_only and os.path.exists(path):
+            # 읽기 전용 (dry-run): 사용자 파일 변경분을 DB 에 반영하지 않고 기존 색인만 조회
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=60, check_same_thread=False)
+            self.conn.create_function("selected", 1, lambda name: int(self.selected(name)), deterministic=True)
+            self.warn_if_stale()
+            return
+        # 읽기 전용인데 DB 가 없으면 메모리 DB 에 사용자 파일을 읽어 색인 구성
+        self.conn = sqlite3.connect(":memory:" if read_only else path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.create_function("selected", 1, lambda name: int(self.selected(name)), deterministic=True)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS subscribers (
+                name TEXT PRIMARY KEY,
+                phone TEXT NOT NULL,
+                digest TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS subscriptions (
+                notice_type TEXT NOT NULL,
+                condition_key TEXT NOT NULL,
+                name TEXT NOT NULL,
+                condition TEXT NOT NULL,
+                PRIMARY KEY (notice_type, condition_key, name)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_subscriptions_name ON subscriptions (name);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            """
+        )
+        self.reload()
+
+    @property
+    def user_count(self):
+        """처리 대상 사용자 수"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM subscribers WHERE selected(name)").fetchone()[0]
+
+    def upsert_user(self, user):
+        """사용자 추가·수정 - 내용이 바뀐 경우에만 구독 색인 갱신, 갱신 여부 반환"""
+        digest = hashlib.sha1(json.dumps(user, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        name = user['name']
+        row = self.conn.execute("SELECT digest FROM subscribers WHERE name = ?", (name,)).fetchone()
+        if row and row[0] == digest:
+            return False
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO subscribers (name, phone, digest) VALUES (?, ?, ?)",
+            (name, user['phone'], digest),
+        )
+        self.conn.execute("DELETE FROM subscriptions WHERE name = ?", (name,))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO subscriptions (notice_type, condition_key, name, condition) VALUES (?, ?, ?, ?)",
+            [
+                (c.get('type'), condition_key(c), name, json.dumps(c, ensure_ascii=False))
+                for c in user.get('search_conditions', [])
+            ],
+        )
+        return True
+
+    def remove_user(self, name):
+        """사용자와 구독 삭제"""
+        self.conn.execute("DELETE FROM subscriptions WHERE name = ?", (name,))
+        self.conn.execute("DELETE FROM subscribers WHERE name = ?", (name,))
+
+    def warn_if_stale(self):
+        """사용자 파일이 DB 에 반영된 이후 바뀌었으면 안내 출력 (읽기 전용 모드)"""
+        try:
+            mtime = str(os.path.getmtime(self.source))
+        except OSError:
+            return
+        with self.lock:
+            synced = self.conn.execute("SELECT value FROM meta WHERE key = 'source_mtime'").fetchone()
+        if not synced or synced[0] != mtime:
+            print(f"[구독자] 읽기 전용: {self.source} 의 변경분은 반영하지 않고 기존 DB 로 조회")
+
+    def reload(self):
+        """사용자 파일이 바뀌었으면 변경분만 반영 - 처리 대상 사용자 수 반환"""
+        try:
+            mtime = str(os.path.getmtime(self.source))
+        except OSError:
+            return self.user_count
+
+        with self.lock, self.conn:
+            synced = self.conn.execute("SELECT value FROM meta WHERE key = 'source_mtime'").fetchone()
+            if not synced or synced[0] != mtime:
+                seen = set()
+                changed = 0
+                for user in iter_users(self.source):
+                    seen.add(user['name'])
+                    changed += self.upsert_user(user)
+                removed = [
+                    name for (name,) in self.conn.execute("SELECT name FROM subscribers").fetchall()
+                    if name not in seen
+                ]
+                for name in removed:
+                    self.remove_user(name)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('source_mtime', ?)", (mtime,)
+                )
+                print(f"[구독자] {self.source} 반영: 변경 {changed}명, 삭제 {len(removed)}명")
+        return self.user_count
+
+    def conditions(self, notice_type):
+        """공고 유형의 서로 다른 검색 조건 목록 (처리 대상 사용자가 구독한 조건만)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT MIN(condition) FROM subscriptions WHERE notice_type = ? AND selected(name) "
+                "GROUP BY condition_key",
+                (notice_type,),
+            ).fetchall()
+        return [json.loads(condition) for (condition,) in rows]
+
+    def subscribers(self, notice_type, condition):
+        """검색 조건 구독자 (이름, 전화번호) 목록"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT s.name, u.phone FROM subscriptions s JOIN subscribers u ON u.name = s.name "
+                "WHERE s.notice_type = ? AND s.condition_key = ? AND selected(s.name) ORDER BY s.name",
+                (notice_type, condition_key(condition)),
+            ).fetchall()
+
+    def phone_of(self, name):
+        """처리 대상 사용자의 전화번호 - 없으면 None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT phone FROM subscribers WHERE name = ? AND selected(name)", (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        """저장소 닫기"""
+        self.conn.close()
+
+def open_subscriber_store(shard=None, names=None, read_only=False):
+    """USERS_BACKEND 설정에 따른 구독자 저장소 생성 (read_only 이면 DB 에 기록하지 않음)"""
+    source = os.getenv('USERS_FILE', USERS_FILE)
+    if os.getenv('USERS_BACKEND', USERS_BACKEND_JSON) == USERS_BACKEND_SQLITE:
+        return SqliteSubscriberStore(os.getenv('USERS_DB', USERS_DB_FILE), source, shard, names, read_only)
+    return JsonSubscriberStore(source, shard, names)
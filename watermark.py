@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+from common import TIME_FORMAT, get_batch_time_ranges, load_json, save_json
+
+# 공고 유형별 마지막 처리 완료 시점(inqryEndDt) 저장 파일
+WATERMARK_FILE = "watermarks.json"
+
+def load_watermarks(path=WATERMARK_FILE):
+    """공고 유형별 워터마크 로딩"""
+    return load_json(path)
+
+def save_watermarks(watermarks, path=WATERMARK_FILE):
+    """워터마크 저장 (임시 파일 작성 후 교체)"""
+    save_json(watermarks, path)
+
+def watermark_windows(watermarks, type_names, now, max_lookback_days=7):
+    """공고 유형별 조회 구간 계산 - 워터마크부터 현재(분 단위 절사)까지
+
+    워터마크가 없으면 직전 배치 구간 시작 시각부터 조회하고,
+    오래 중단된 경우에도 max_lookback_days 이전까지만 조회한다.
+    """
+    end = now.replace(second=0, microsecond=0)
+    earliest = end - timedelta(days=max_lookback_days)
+    fallback_bgn = get_batch_time_ranges(now)[0]
+
+    windows = {}
+    for type_name in type_names:
+        bgn = datetime.strptime(watermarks.get(type_name) or fallback_bgn, TIME_FORMAT)
+        bgn = max(bgn, earliest)
+        if bgn < end:
+            windows[type_name] = (bgn.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT))
+    return windows